@@ -37,7 +37,9 @@ Usage:
 
 import argparse
 import csv
+import hashlib
 import json
+import math
 import os
 import re
 import sqlite3
@@ -54,11 +56,32 @@ try:
 except ImportError:
     pass
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Database location
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 DB_PATH = DATA_DIR / "knowledge_graph.db"
 
+# Connection tuning: the pipeline is read-heavy (tier checks, propagation,
+# exports), so use WAL with a 64MB page cache and 256MB memory map.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128). The
+# analysis modules issue many distinct point queries against one shared
+# connection, so keep enough to avoid re-preparing hot statements.
+STATEMENT_CACHE_SIZE = 512
+
 
 # ============================================================================
 # SQLite Schema
@@ -162,6 +185,8 @@ CREATE INDEX IF NOT EXISTS idx_entities_identity ON entities(identity);
 CREATE INDEX IF NOT EXISTS idx_entities_confidence ON entities(confidence);
 CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source);
 CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target);
+CREATE INDEX IF NOT EXISTS idx_relationships_source_type ON relationships(source, relationship_type, confidence);
+CREATE INDEX IF NOT EXISTS idx_relationships_target_type ON relationships(target, relationship_type, confidence);
 CREATE INDEX IF NOT EXISTS idx_evidence_entity ON evidence(entity_address);
 CREATE INDEX IF NOT EXISTS idx_queue_status ON processing_queue(status, priority);
 """
@@ -171,19 +196,78 @@ CREATE INDEX IF NOT EXISTS idx_queue_status ON processing_queue(status, priority
 # Database Operations
 # ============================================================================
 
+def _has_non_finite(value) -> bool:
+    """True if a JSON-like value holds a NaN or infinite float anywhere."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def dump_json(value) -> str:
+    """
+    Serialize a value for a JSON text column, with orjson when it is installed.
+
+    orjson writes NaN and infinities as null, so values holding them go
+    through the stdlib to keep storing NaN/Infinity as before. orjson also
+    writes non-ASCII text as raw UTF-8 rather than \\u escapes; both forms
+    parse to the same strings.
+    """
+    if HAS_ORJSON and not _has_non_finite(value):
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits, which the stdlib encodes fine
+    return json.dumps(value)
+
+
+class _AddressBloom:
+    """Fixed-size Bloom filter over lowercased address strings (~1% false positives)."""
+
+    _HASHES = 7
+    _BITS_PER_ITEM = 10
+
+    def __init__(self, capacity: int):
+        self.size = max(64, capacity * self._BITS_PER_ITEM)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self._HASHES))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
 class KnowledgeGraph:
     """SQLite-based knowledge graph for whale intelligence."""
 
     def __init__(self, db_path: Path = DB_PATH):
         self.db_path = db_path
         self.conn = None
+        # Bloom filter of entities with an identity or non-zero confidence,
+        # plus the data_version it was built against (see build_identity_bloom)
+        self._identity_bloom = None
+        self._identity_bloom_version = None
 
     def connect(self) -> sqlite3.Connection:
         """Get database connection."""
         if self.conn is None:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            self.conn = sqlite3.connect(str(self.db_path))
+            self.conn = sqlite3.connect(str(self.db_path),
+                                        cached_statements=STATEMENT_CACHE_SIZE)
             self.conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                self.conn.execute(pragma)
         return self.conn
 
     def close(self):
@@ -191,6 +275,8 @@ class KnowledgeGraph:
         if self.conn:
             self.conn.close()
             self.conn = None
+        self._identity_bloom = None
+        self._identity_bloom_version = None
 
     def initialize(self):
         """Initialize database schema."""
@@ -319,6 +405,58 @@ class KnowledgeGraph:
         rows = conn.execute(query, values).fetchall()
         return [dict(row) for row in rows]
 
+    _IDENTITY_BLOOM_TRIGGERS = (
+        """CREATE TEMP TRIGGER IF NOT EXISTS identity_bloom_insert
+           AFTER INSERT ON entities
+           WHEN (NEW.identity IS NOT NULL AND NEW.identity != '') OR NEW.confidence > 0
+           BEGIN SELECT identity_bloom_add(NEW.address); END""",
+        """CREATE TEMP TRIGGER IF NOT EXISTS identity_bloom_update
+           AFTER UPDATE OF identity, confidence ON entities
+           WHEN (NEW.identity IS NOT NULL AND NEW.identity != '') OR NEW.confidence > 0
+           BEGIN SELECT identity_bloom_add(NEW.address); END""",
+    )
+
+    def build_identity_bloom(self):
+        """
+        Build the identity Bloom filter used by may_be_identified.
+
+        Meant for bulk tier workloads: building scans every identified entity,
+        so one-off lookups are cheaper without it. Temporary triggers fold
+        identity and confidence writes on this connection into the filter,
+        including raw SQL updates; other writes leave it alone.
+        """
+        conn = self.connect()
+        rows = conn.execute(
+            """SELECT address FROM entities
+               WHERE (identity IS NOT NULL AND identity != '') OR confidence > 0"""
+        ).fetchall()
+        bloom = _AddressBloom(len(rows))
+        for row in rows:
+            bloom.add(row[0])
+
+        conn.create_function("identity_bloom_add", 1, bloom.add)
+        for trigger in self._IDENTITY_BLOOM_TRIGGERS:
+            conn.execute(trigger)
+        self._identity_bloom = bloom
+        self._identity_bloom_version = conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def may_be_identified(self, address: str) -> bool:
+        """
+        Cheap negative lookup for "does this entity carry any identity signal".
+
+        False guarantees the entity has no identity and zero confidence; True
+        may be a false positive. Always True unless build_identity_bloom has
+        run, and again once another connection commits, since those writes
+        bypass the triggers.
+        """
+        if self._identity_bloom is None:
+            return True
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._identity_bloom_version:
+            self._identity_bloom = None
+            return True
+        return address.lower() in self._identity_bloom
+
     def get_unidentified(self, limit: int = 100) -> List[dict]:
         """Get unidentified entities."""
         return self.get_entities({'identified': False}, limit)
@@ -450,7 +588,7 @@ class KnowledgeGraph:
                    (source, target, relationship_type, confidence, evidence, created_at)
                    VALUES (?, ?, ?, ?, ?, ?)""",
                 (source.lower(), target.lower(), rel_type,
-                 confidence, json.dumps(evidence or {}), now)
+                 confidence, dump_json(evidence or {}), now)
             )
             conn.commit()
             return True
@@ -513,10 +651,42 @@ class KnowledgeGraph:
                (entity_address, source, claim, confidence, url, raw_data, created_at)
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
             (address.lower(), source, claim, confidence, url,
-             json.dumps(raw_data or {}), now)
+             dump_json(raw_data or {}), now)
         )
         conn.commit()
 
+    def add_evidence_bulk(self, rows: List[Tuple], commit: bool = True):
+        """
+        Add many evidence rows in a single transaction.
+
+        Each row is (address, source, claim, confidence, url, raw_data), as
+        passed to add_evidence; missing entities are created. With
+        commit=False the transaction is left open so the caller can add
+        further writes and commit them together.
+        """
+        conn = self.connect()
+        now = datetime.now(timezone.utc).isoformat()
+
+        rows = list(rows)
+        for row in rows:
+            self._validate_address(row[0])
+
+        conn.executemany(
+            """INSERT OR IGNORE INTO entities (address, first_seen, last_updated)
+               VALUES (?, ?, ?)""",
+            [(row[0].lower(), now, now) for row in rows]
+        )
+        conn.executemany(
+            """INSERT INTO evidence
+               (entity_address, source, claim, confidence, url, raw_data, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [(address.lower(), source, claim, confidence, url,
+              dump_json(raw_data or {}), now)
+             for address, source, claim, confidence, url, raw_data in rows]
+        )
+        if commit:
+            conn.commit()
+
     def get_evidence(self, address: str) -> List[dict]:
         """Get all evidence for an entity."""
         conn = self.connect()
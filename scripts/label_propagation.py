@@ -40,6 +40,9 @@ Usage:
     # Show confidence tier for an address
     python3 label_propagation.py --tier 0x5678...
 
+    # Bulk tier audit over one open connection (one address per stdin line)
+    cat addresses.txt | python3 label_propagation.py --server
+
     # Integration with knowledge graph
     from label_propagation import propagate_identity, run_full_propagation, calculate_confidence_tier
     propagate_identity(kg, seed_address, identity, confidence)
@@ -47,6 +50,7 @@ Usage:
 """
 
 import argparse
+import functools
 import json
 import os
 import re
@@ -109,6 +113,7 @@ TIMEZONE_TOLERANCE_STRICT = 1   # Same region (UK/EU, East Coast US, etc.)
 TIMEZONE_TOLERANCE_LOOSE = 2    # Adjacent regions (still likely same operator)
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_timezone_offset(tz_str: str) -> Optional[int]:
     """Parse timezone string like 'UTC+8' or 'UTC-5' to integer offset."""
     if not tz_str:
@@ -158,6 +163,7 @@ def get_timezone_from_evidence(kg: 'KnowledgeGraph', address: str) -> Optional[s
     return None
 
 
+@functools.lru_cache(maxsize=1024)
 def get_expected_timezone_for_identity(identity: str) -> Optional[List[str]]:
     """Get expected timezone(s) for a known entity identity.
 
@@ -183,6 +189,7 @@ def get_expected_timezone_for_identity(identity: str) -> Optional[List[str]]:
     return None
 
 
+@functools.lru_cache(maxsize=1024)
 def calculate_timezone_difference(tz1: str, tz2: str) -> int:
     """Calculate absolute hour difference between two timezones.
     Returns -1 if either timezone is unparseable (caller should treat as unknown,
@@ -538,6 +545,21 @@ def propagate_identity(
     return stats
 
 
+# Frontier-at-a-time lookups for check_identity_inheritance: the frontier is
+# passed as one JSON array so each BFS hop costs two queries, not two per node.
+_SQL_FRONTIER_IDENTITIES = """SELECT address, identity, confidence FROM entities
+    WHERE address IN (SELECT value FROM json_each(?))"""
+
+_SQL_FRONTIER_EDGES = """SELECT source AS node, target AS other, relationship_type, confidence
+    FROM relationships
+    WHERE source IN (SELECT value FROM json_each(?))
+    UNION ALL
+    SELECT target AS node, source AS other, relationship_type, confidence
+    FROM relationships
+    WHERE target IN (SELECT value FROM json_each(?))
+      AND source != target"""
+
+
 def check_identity_inheritance(
     kg: 'KnowledgeGraph',
     address: str,
@@ -549,7 +571,8 @@ def check_identity_inheritance(
     Check what identities an unknown address might inherit from the graph.
 
     Performs backward propagation from the unknown to find connected
-    identified entities.
+    identified entities. The BFS runs one hop at a time: identities and
+    relationships for the whole frontier are fetched with one query each.
 
     Args:
         kg: Knowledge graph instance
@@ -566,74 +589,76 @@ def check_identity_inheritance(
     if verbose:
         print(f"\n  Checking identity inheritance for {address[:16]}...")
 
-    # BFS from the target address
-    queue = deque([(address, 1.0, 0, [address], [])])
+    # BFS frontier for the current hop: (address, confidence, path, relationship_chain)
+    frontier = [(address, 1.0, [address], [])]
     visited = {address: 1.0}
 
     # Found identities
     found_identities: List[Dict[str, Any]] = []
 
     conn = kg.connect()
+    hops = 0
 
-    while queue:
-        current, confidence, hops, path, rel_chain = queue.popleft()
+    while frontier and hops <= max_hops:
+        frontier_addrs = json.dumps(sorted({entry[0] for entry in frontier}))
 
-        if hops > max_hops:
-            continue
+        # Check which frontier addresses have an identity
+        identities = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(_SQL_FRONTIER_IDENTITIES, (frontier_addrs,))
+        }
 
-        if confidence < min_confidence:
-            continue
+        for current, confidence, path, rel_chain in frontier:
+            entity = identities.get(current)
+            if entity and entity[0] and current != address:
+                existing_identity = entity[0]
+                existing_confidence = entity[1] or 0.5
+
+                # Don't inherit from other propagated labels
+                if "(propagated)" not in existing_identity:
+                    combined_confidence = confidence * existing_confidence
+
+                    found_identities.append({
+                        'identity': existing_identity,
+                        'source_address': current,
+                        'confidence': combined_confidence,
+                        'hops': hops,
+                        'path': path,
+                        'relationship_chain': rel_chain
+                    })
 
-        # Check if current address has an identity
-        entity = conn.execute(
-            "SELECT identity, confidence FROM entities WHERE address = ?",
-            (current,)
-        ).fetchone()
-
-        if entity and entity[0] and current != address:
-            existing_identity = entity[0]
-            existing_confidence = entity[1] or 0.5
-
-            # Don't inherit from other propagated labels
-            if "(propagated)" not in existing_identity:
-                combined_confidence = confidence * existing_confidence
-
-                found_identities.append({
-                    'identity': existing_identity,
-                    'source_address': current,
-                    'confidence': combined_confidence,
-                    'hops': hops,
-                    'path': path,
-                    'relationship_chain': rel_chain
-                })
-
-                if verbose:
-                    print(f"    Found: '{existing_identity}' via {hops} hops ({combined_confidence:.0%})")
-
-        # Get relationships
-        relationships = conn.execute(
-            """SELECT source, target, relationship_type, confidence as rel_confidence
-               FROM relationships
-               WHERE source = ? OR target = ?""",
-            (current, current)
-        ).fetchall()
+                    if verbose:
+                        print(f"    Found: '{existing_identity}' via {hops} hops ({combined_confidence:.0%})")
 
-        for row in relationships:
-            source, target, rel_type, rel_confidence = row
-            other = target if source == current else source
+        # Neighbors beyond max_hops would never be visited
+        if hops == max_hops:
+            break
 
-            if other in visited and visited[other] >= confidence:
-                continue
+        # Get relationships for the whole frontier
+        edges: Dict[str, List[Tuple[str, str, float]]] = defaultdict(list)
+        for node, other, rel_type, rel_confidence in conn.execute(
+            _SQL_FRONTIER_EDGES, (frontier_addrs, frontier_addrs)
+        ):
+            edges[node].append((other, rel_type, rel_confidence))
 
-            rel_weight = RELATIONSHIP_WEIGHTS.get(rel_type, 0.5)
-            rel_conf = rel_confidence if rel_confidence else 0.5
-            new_confidence = confidence * rel_weight * rel_conf
+        next_frontier = []
+        for current, confidence, path, rel_chain in frontier:
+            for other, rel_type, rel_confidence in edges.get(current, ()):
+                if other in visited and visited[other] >= confidence:
+                    continue
 
-            if new_confidence < min_confidence:
-                continue
+                rel_weight = RELATIONSHIP_WEIGHTS.get(rel_type, 0.5)
+                rel_conf = rel_confidence if rel_confidence else 0.5
+                new_confidence = confidence * rel_weight * rel_conf
 
-            visited[other] = new_confidence
-            queue.append((other, new_confidence, hops + 1, path + [other], rel_chain + [rel_type]))
+                if new_confidence < min_confidence:
+                    continue
+
+                visited[other] = new_confidence
+                next_frontier.append((other, new_confidence, path + [other], rel_chain + [rel_type]))
+
+        frontier = next_frontier
+        hops += 1
 
     # Sort by confidence
     found_identities.sort(key=lambda x: -x['confidence'])
@@ -832,36 +857,146 @@ def suggest_identity(
 # Trusted external verification sources
 VERIFIED_SOURCES = {'Arkham', 'Nansen', 'arkham', 'nansen'}
 
+# Timezone consistency states (tri-state result of _check_timezone_consistency)
+TZ_UNKNOWN = 0
+TZ_MATCH = 1
+TZ_MISMATCH = 2
 
-def _has_verified_source(kg: 'KnowledgeGraph', address: str) -> bool:
-    """Check if address has evidence from a trusted external source (Arkham/Nansen)."""
-    conn = kg.connect()
-    rows = conn.execute(
-        """SELECT source FROM evidence
-           WHERE entity_address = ?""",
-        (address.lower(),)
-    ).fetchall()
 
-    for row in rows:
-        source = row[0] if row[0] else ''
-        # Match exact source or source containing the name (e.g., "Arkham Intelligence")
-        for verified in VERIFIED_SOURCES:
-            if verified.lower() in source.lower():
-                return True
-    return False
+def _tier_signal_index(has_verified: bool, has_behavioral: bool,
+                       tz_consistent: Optional[bool], has_conflicts: bool) -> int:
+    """Pack the tier signals into a TIER_TABLE index.
+
+    Bit layout: verified(4) | behavioral(3) | timezone state(2..1) | conflicts(0).
+    """
+    if tz_consistent is True:
+        tz_state = TZ_MATCH
+    elif tz_consistent is False:
+        tz_state = TZ_MISMATCH
+    else:
+        tz_state = TZ_UNKNOWN
+    return ((bool(has_verified) << 4) | (bool(has_behavioral) << 3)
+            | (tz_state << 1) | bool(has_conflicts))
 
 
-def _has_behavioral_match(kg: 'KnowledgeGraph', address: str) -> bool:
-    """Check if address has behavioral evidence (timezone, fingerprint, etc.)."""
+def _tier_rule(sig: int) -> Tuple[str, float, float, float]:
+    """Tier policy for one signal combination: (tier_name, floor, ceiling, scale).
+
+    Rules are listed in priority order; the score is
+    max(floor, min(ceiling, existing_confidence * scale)).
+    """
+    has_verified = bool(sig & 0b10000)
+    has_behavioral = bool(sig & 0b01000)
+    tz_state = (sig >> 1) & 0b11
+    has_conflicts = bool(sig & 0b00001)
+
+    # VERIFIED (90-100%): Arkham/Nansen confirmed + behavioral match
+    if has_verified and has_behavioral:
+        return ('VERIFIED', 0.90, 1.0, 1.0)
+    # VERIFIED (90-95%): Arkham/Nansen confirmed even without behavioral
+    # (Arkham alone is highly reliable)
+    if has_verified:
+        return ('VERIFIED', 0.90, 0.95, 1.0)
+    # UNVERIFIED (30-49%): Any conflicts detected - demote regardless of other signals
+    if has_conflicts:
+        return ('UNVERIFIED', 0.30, 0.49, 0.5)
+    # UNVERIFIED (30-49%): Timezone mismatch detected
+    if tz_state == TZ_MISMATCH:
+        return ('UNVERIFIED', 0.30, 0.49, 0.6)
+    # VALIDATED (70-89%): Timezone matches + no conflicts
+    if tz_state == TZ_MATCH:
+        return ('VALIDATED', 0.70, 0.89, 1.0)
+    # CANDIDATE (50-69%): Has identity but can't fully validate
+    # This covers: propagated labels without timezone data, CIO/temporal links
+    # where timezone is unknown
+    return ('CANDIDATE', 0.50, 0.69, 1.0)
+
+
+# Decision table indexed by _tier_signal_index(): (tier_name, floor, ceiling, scale)
+TIER_TABLE: List[Tuple[str, float, float, float]] = [_tier_rule(sig) for sig in range(32)]
+
+
+# ---- Tier helper SQL ----
+# Built once at import so every call reuses the same statement text and hits
+# the connection's prepared-statement cache instead of re-parsing SQL.
+
+# Match exact source or source containing the name (e.g., "Arkham Intelligence").
+# LIKE is case-insensitive for ASCII, so one pattern per distinct source suffices.
+_VERIFIED_SOURCE_PATTERNS = tuple(f'%{v}%' for v in sorted({v.lower() for v in VERIFIED_SOURCES}))
+
+_SQL_HAS_VERIFIED = f"""SELECT 1 FROM evidence
+    WHERE entity_address = ?
+    AND ({' OR '.join(['source LIKE ?'] * len(_VERIFIED_SOURCE_PATTERNS))})
+    LIMIT 1"""
+
+_SQL_HAS_BEHAVIORAL = """SELECT 1 FROM evidence
+    WHERE entity_address = ?
+    AND (source = 'Behavioral' OR source LIKE '%fingerprint%'
+         OR source LIKE '%timezone%')
+    LIMIT 1"""
+
+# Relationship types strong enough to flag cross-cluster label conflicts
+_STRONG_CONFLICT_TYPES = ('temporal_correlation', 'same_cluster', 'same_entity',
+                          'same_signer', 'shared_deposits')
+_STRONG_TYPE_PLACEHOLDERS = ','.join(['?'] * len(_STRONG_CONFLICT_TYPES))
+
+# Number of distinct confirmed base identities among an address and its strong
+# neighbors. Neighbors come from two index-backed halves instead of
+# `source = ? OR target = ?`; the base identity is everything before the
+# first " (" (same rule as _normalize_identity).
+_SQL_CLUSTER_IDENTITY_COUNT = f"""SELECT COUNT(DISTINCT TRIM(
+        CASE INSTR(identity, ' (') WHEN 0 THEN identity
+        ELSE SUBSTR(identity, 1, INSTR(identity, ' (') - 1) END))
+    FROM entities
+    WHERE address IN (
+        SELECT target FROM relationships
+        WHERE source = ?
+          AND relationship_type IN ({_STRONG_TYPE_PLACEHOLDERS})
+          AND confidence >= 0.7
+        UNION ALL
+        SELECT source FROM relationships
+        WHERE target = ?
+          AND relationship_type IN ({_STRONG_TYPE_PLACEHOLDERS})
+          AND confidence >= 0.7
+        UNION ALL
+        SELECT ?
+    )
+    AND identity IS NOT NULL
+    AND identity != ''
+    AND identity NOT LIKE '%(propagated)%'"""
+
+_SQL_ENTITY_IDENTITY = "SELECT identity FROM entities WHERE address = ?"
+
+# Everything from the first " (" on: "(cluster member)", "(propagated)", etc.
+_IDENTITY_SUFFIX_RE = re.compile(r' \(.*', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_identity(identity: str) -> str:
+    """Strip parenthesized suffixes, e.g. 'Trend Research (propagated)' -> 'Trend Research'."""
+    return _IDENTITY_SUFFIX_RE.sub('', identity, count=1).strip()
+
+
+def _has_verified_source(kg: 'KnowledgeGraph', address: str) -> bool:
+    """Check if address has evidence from a trusted external source (Arkham/Nansen).
+
+    Expects a lowercased address (callers normalize once at the API boundary).
+    """
     conn = kg.connect()
     row = conn.execute(
-        """SELECT COUNT(*) FROM evidence
-           WHERE entity_address = ?
-           AND (source = 'Behavioral' OR source LIKE '%fingerprint%'
-                OR source LIKE '%timezone%')""",
-        (address.lower(),)
+        _SQL_HAS_VERIFIED, (address, *_VERIFIED_SOURCE_PATTERNS)
     ).fetchone()
-    return row[0] > 0 if row else False
+    return row is not None
+
+
+def _has_behavioral_match(kg: 'KnowledgeGraph', address: str) -> bool:
+    """Check if address has behavioral evidence (timezone, fingerprint, etc.).
+
+    Expects a lowercased address.
+    """
+    conn = kg.connect()
+    row = conn.execute(_SQL_HAS_BEHAVIORAL, (address,)).fetchone()
+    return row is not None
 
 
 def _check_cross_cluster_conflicts(kg: 'KnowledgeGraph', address: str) -> bool:
@@ -872,58 +1007,19 @@ def _check_cross_cluster_conflicts(kg: 'KnowledgeGraph', address: str) -> bool:
     other strong links) to entities that have different non-propagated identities.
     This is a strong signal of label contamination.
 
-    Returns True if conflicts exist, False otherwise.
+    Expects a lowercased address. Returns True if conflicts exist, False otherwise.
     """
-    address = address.lower()
     conn = kg.connect()
 
-    # Get all addresses related to this one via strong relationship types
-    strong_types = ('temporal_correlation', 'same_cluster', 'same_entity',
-                    'same_signer', 'shared_deposits')
-    placeholders = ','.join(['?'] * len(strong_types))
-
-    related = conn.execute(
-        f"""SELECT DISTINCT
-                CASE WHEN source = ? THEN target ELSE source END as other_addr
-            FROM relationships
-            WHERE (source = ? OR target = ?)
-              AND relationship_type IN ({placeholders})
-              AND confidence >= 0.7""",
-        (address, address, address, *strong_types)
-    ).fetchall()
-
-    # Collect non-propagated identities from related addresses
-    identities = set()
-    for row in related:
-        other = row[0]
-        entity = conn.execute(
-            """SELECT identity FROM entities
-               WHERE address = ?
-               AND identity IS NOT NULL
-               AND identity != ''
-               AND identity NOT LIKE '%(propagated)%'""",
-            (other,)
-        ).fetchone()
-        if entity and entity[0]:
-            # Normalize: strip suffixes like " (cluster member)" for comparison
-            base_identity = entity[0].split(' (')[0].strip()
-            identities.add(base_identity)
-
-    # Also check the address's own identity
-    own_entity = conn.execute(
-        """SELECT identity FROM entities
-           WHERE address = ?
-           AND identity IS NOT NULL
-           AND identity != ''
-           AND identity NOT LIKE '%(propagated)%'""",
-        (address,)
+    # Count distinct non-propagated identities across the address and its
+    # strong neighbors, normalized (e.g. " (cluster member)" stripped) in SQL
+    row = conn.execute(
+        _SQL_CLUSTER_IDENTITY_COUNT,
+        (address, *_STRONG_CONFLICT_TYPES, address, *_STRONG_CONFLICT_TYPES, address)
     ).fetchone()
-    if own_entity and own_entity[0]:
-        base_identity = own_entity[0].split(' (')[0].strip()
-        identities.add(base_identity)
 
     # More than one distinct identity in the cluster = conflict
-    return len(identities) > 1
+    return row[0] > 1
 
 
 def _check_timezone_consistency(kg: 'KnowledgeGraph', address: str) -> Optional[bool]:
@@ -934,22 +1030,19 @@ def _check_timezone_consistency(kg: 'KnowledgeGraph', address: str) -> Optional[
         True  - timezone matches expected for identity
         False - timezone mismatch detected
         None  - cannot determine (no timezone data or no identity)
+
+    Expects a lowercased address.
     """
-    address = address.lower()
     conn = kg.connect()
 
     # Get the address's identity
-    entity = conn.execute(
-        "SELECT identity FROM entities WHERE address = ?",
-        (address,)
-    ).fetchone()
+    entity = conn.execute(_SQL_ENTITY_IDENTITY, (address,)).fetchone()
 
     if not entity or not entity[0]:
         return None
 
-    identity = entity[0]
-    # Strip propagated suffix for lookup
-    base_identity = identity.replace(' (propagated)', '').strip()
+    # Strip propagated / cluster-member suffixes for lookup
+    base_identity = _normalize_identity(entity[0])
 
     # Get the address's timezone
     target_tz = get_timezone_from_evidence(kg, address)
@@ -999,6 +1092,12 @@ def calculate_confidence_tier(
         Tuple of (tier_name, confidence_score) e.g. ("VERIFIED", 0.95)
     """
     address = address.lower()
+
+    # Fast path when the caller built the identity filter: most addresses
+    # have never been identified
+    if not kg.may_be_identified(address):
+        return ("UNKNOWN", 0.0)
+
     conn = kg.connect()
 
     # Step 1: Check if entity exists and has any identity
@@ -1012,12 +1111,12 @@ def calculate_confidence_tier(
 
     if not has_identity:
         # No identity at all - check if there are any signals
-        evidence_count = conn.execute(
-            "SELECT COUNT(*) FROM evidence WHERE entity_address = ?",
+        has_evidence = conn.execute(
+            "SELECT 1 FROM evidence WHERE entity_address = ? LIMIT 1",
             (address,)
-        ).fetchone()[0]
+        ).fetchone() is not None
 
-        if evidence_count == 0:
+        if not has_evidence:
             return ("UNKNOWN", 0.0)
         else:
             # Has evidence but no identity assigned yet
@@ -1026,50 +1125,27 @@ def calculate_confidence_tier(
     # Step 2: Check for Arkham/Nansen verification
     has_verified_source = _has_verified_source(kg, address)
 
-    # Step 3: Check behavioral match
-    has_behavioral = _has_behavioral_match(kg, address)
+    if has_verified_source:
+        # Step 3: Check behavioral match (only splits the VERIFIED tier)
+        has_behavioral = _has_behavioral_match(kg, address)
+        # VERIFIED ignores timezone and conflicts, so skip those scans
+        tz_consistent = None
+        has_conflicts = False
+    else:
+        has_behavioral = False
 
-    # Step 4: Check timezone consistency
-    tz_consistent = _check_timezone_consistency(kg, address)
+        # Step 4: Check timezone consistency
+        tz_consistent = _check_timezone_consistency(kg, address)
 
-    # Step 5: Check for cross-cluster conflicts
-    has_conflicts = _check_cross_cluster_conflicts(kg, address)
+        # Step 5: Check for cross-cluster conflicts
+        has_conflicts = _check_cross_cluster_conflicts(kg, address)
 
     # ================================================================
-    # Tier Assignment Logic
+    # Tier Assignment Logic (see _tier_rule / TIER_TABLE)
     # ================================================================
-
-    # VERIFIED (90-100%): Arkham/Nansen confirmed + behavioral match
-    if has_verified_source and has_behavioral:
-        score = max(0.90, min(1.0, existing_confidence))
-        return ("VERIFIED", score)
-
-    # VERIFIED (90-95%): Arkham/Nansen confirmed even without behavioral
-    # (Arkham alone is highly reliable)
-    if has_verified_source:
-        score = max(0.90, min(0.95, existing_confidence))
-        return ("VERIFIED", score)
-
-    # UNVERIFIED (30-49%): Any conflicts detected - demote regardless of other signals
-    if has_conflicts:
-        score = max(0.30, min(0.49, existing_confidence * 0.5))
-        return ("UNVERIFIED", score)
-
-    # UNVERIFIED (30-49%): Timezone mismatch detected
-    if tz_consistent is False:  # Explicitly False, not None
-        score = max(0.30, min(0.49, existing_confidence * 0.6))
-        return ("UNVERIFIED", score)
-
-    # VALIDATED (70-89%): Timezone matches + no conflicts
-    if tz_consistent is True and not has_conflicts:
-        score = max(0.70, min(0.89, existing_confidence))
-        return ("VALIDATED", score)
-
-    # CANDIDATE (50-69%): Has identity but can't fully validate
-    # This covers: propagated labels without timezone data, CIO/temporal links
-    # where timezone is unknown
-    score = max(0.50, min(0.69, existing_confidence))
-    return ("CANDIDATE", score)
+    sig = _tier_signal_index(has_verified_source, has_behavioral, tz_consistent, has_conflicts)
+    tier_name, floor, ceiling, scale = TIER_TABLE[sig]
+    return (tier_name, max(floor, min(ceiling, existing_confidence * scale)))
 
 
 # ============================================================================
@@ -1083,6 +1159,7 @@ def process_new_identification(kg: 'KnowledgeGraph', address: str, identity: str
     Call this whenever you identify a new entity to automatically update
     related addresses.
     """
+    address = address.lower()
     print(f"\n  Processing new identification: {address[:16]}... = '{identity}'")
 
     # First, set the identity on the seed
@@ -1105,6 +1182,27 @@ def process_new_identification(kg: 'KnowledgeGraph', address: str, identity: str
 # Standalone Mode
 # ============================================================================
 
+def serve_tiers(kg: 'KnowledgeGraph', stream=None, out=None):
+    """
+    Tier every address read from `stream` (default stdin) over one connection.
+
+    Writes one tab-separated "address, tier, score" line per input address,
+    flushing after each so the command can sit at the end of a pipe. Blank
+    lines and lines starting with '#' are skipped.
+    """
+    stream = stream or sys.stdin
+    out = out or sys.stdout
+    kg.build_identity_bloom()
+
+    for line in stream:
+        address = line.strip().lower()
+        if not address or address.startswith('#'):
+            continue
+        tier_name, tier_score = calculate_confidence_tier(address, kg)
+        out.write(f"{address}\t{tier_name}\t{tier_score:.2f}\n")
+        out.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Label Propagation Algorithm",
@@ -1125,6 +1223,9 @@ Examples:
 
     # Show confidence tier for an address
     python3 label_propagation.py --tier 0x5678...
+
+    # Bulk tier audit: read addresses from stdin, print "address<TAB>tier<TAB>score"
+    cat addresses.txt | python3 label_propagation.py --server
         """
     )
 
@@ -1137,6 +1238,9 @@ Examples:
     parser.add_argument("--check", help="Check what identities an address might inherit")
     parser.add_argument("--suggest", help="Suggest identity for an unknown address")
     parser.add_argument("--tier", help="Show confidence tier for an address")
+    parser.add_argument("--server", action="store_true",
+                        help="Read addresses from stdin and print their tiers "
+                             "(keeps one connection open for bulk audits)")
     parser.add_argument("--max-hops", type=int, default=MAX_HOPS,
                         help=f"Maximum hops for propagation (default: {MAX_HOPS})")
     parser.add_argument("--min-confidence", type=float, default=MIN_PROPAGATION_CONFIDENCE,
@@ -1146,16 +1250,23 @@ Examples:
 
     args = parser.parse_args()
 
+    # Validate before touching the database
+    if not (args.seed or args.full or args.check or args.suggest or args.tier or args.server):
+        parser.print_help()
+        return
+    if args.seed and not args.identity:
+        parser.error("--identity required with --seed")
+
     # Import knowledge graph
     from build_knowledge_graph import KnowledgeGraph
     kg = KnowledgeGraph()
     kg.connect()
 
     try:
-        if args.seed:
-            if not args.identity:
-                parser.error("--identity required with --seed")
+        if args.server:
+            serve_tiers(kg)
 
+        elif args.seed:
             stats = propagate_identity(
                 kg,
                 args.seed,
@@ -1240,7 +1351,8 @@ Examples:
                         print(f"  - '{alt['identity']}' ({alt['confidence']:.0%})")
 
         elif args.tier:
-            tier_name, tier_score = calculate_confidence_tier(args.tier, kg)
+            address = args.tier.lower()
+            tier_name, tier_score = calculate_confidence_tier(address, kg)
 
             # Tier display colors/indicators
             tier_indicators = {
@@ -1255,10 +1367,10 @@ Examples:
             print(f"\n{'='*60}")
             print("CONFIDENCE TIER ASSESSMENT")
             print("="*60)
-            print(f"\nAddress: {args.tier.lower()}")
+            print(f"\nAddress: {address}")
 
             # Show identity if available
-            entity = kg.get_entity(args.tier)
+            entity = kg.get_entity(address)
             if entity and entity.get('identity'):
                 print(f"Identity: {entity['identity']}")
                 print(f"Stored confidence: {entity.get('confidence', 0.0):.0%}")
@@ -1278,10 +1390,10 @@ Examples:
 
             # Show signal details
             print(f"\nSignal Details:")
-            has_verified = _has_verified_source(kg, args.tier)
-            has_behavioral = _has_behavioral_match(kg, args.tier)
-            tz_consistent = _check_timezone_consistency(kg, args.tier)
-            has_conflicts = _check_cross_cluster_conflicts(kg, args.tier)
+            has_verified = _has_verified_source(kg, address)
+            has_behavioral = _has_behavioral_match(kg, address)
+            tz_consistent = _check_timezone_consistency(kg, address)
+            has_conflicts = _check_cross_cluster_conflicts(kg, address)
 
             tz_display = {True: 'MATCH', False: 'MISMATCH', None: 'Unknown'}
 
@@ -1298,9 +1410,6 @@ Examples:
             print(f"  UNVERIFIED (30-49%):  Timezone mismatch or conflicts")
             print(f"  UNKNOWN    (0-29%):   No signals")
 
-        else:
-            parser.print_help()
-
     finally:
         kg.close()
 
@@ -22,18 +22,33 @@ import argparse
 import csv
 import json
 import os
+import re
+import sqlite3
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlparse
 
 try:
     import requests
     from dotenv import load_dotenv
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Missing dependencies. Install with: pip install requests python-dotenv")
     sys.exit(1)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 load_dotenv()
 
 # Chain configurations
@@ -89,6 +104,28 @@ CHAINS = {
     },
 }
 
+
+@dataclass(frozen=True)
+class ChainConfig:
+    """A CHAINS entry resolved once, with the decimals scale precomputed."""
+    name: str
+    rpc: str
+    explorer_api: str
+    native_symbol: str
+    scale: int  # 10 ** decimals
+
+    @classmethod
+    def from_chains(cls, name: str) -> "ChainConfig":
+        config = CHAINS[name]
+        return cls(
+            name=name,
+            rpc=config["rpc"],
+            explorer_api=config["explorer_api"],
+            native_symbol=config["native_symbol"],
+            scale=10 ** config["decimals"],
+        )
+
+
 # Common stablecoin addresses across chains
 STABLECOINS = {
     "ethereum": {
@@ -112,12 +149,256 @@ STABLECOINS = {
     },
 }
 
+STABLECOIN_DECIMALS = {"USDC": 6, "USDbC": 6, "USDT": 6, "DAI": 18}
+
+# ERC20 balanceOf(address)
+BALANCE_OF_SELECTOR = "0x70a08231"
+
+# Default per-host request rates; override per chain with e.g. ETHEREUM_RPC_RPS
+# or ETHEREUM_EXPLORER_RPS. Etherscan-family free tiers allow 5 calls/sec.
+DEFAULT_RPC_RPS = 10.0
+DEFAULT_EXPLORER_RPS = 5.0
+
+CACHE_PATH = Path.home() / ".cache" / "multichain_balance.db"
+CACHE_TTL = 30  # seconds; "latest" balances go stale quickly
+CACHE_MEMORY_SIZE = 4096  # most recently used entries kept in memory
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# (connect, read) seconds. Retries cover transient failures, so a dead
+# endpoint should fail fast rather than hold a worker for 10s.
+REQUEST_TIMEOUT = (2, 5)
+# How long an RPC that just failed is skipped in favour of the explorer
+RPC_UNHEALTHY_TTL = 60
+
+HEX_ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+
+# Stands in for the address when batch bodies are pre-serialized; it cannot
+# occur anywhere else in a body (ABI offsets and lengths are small words).
+ADDRESS_PLACEHOLDER = "f" * 40
+
+# Multicall3 is deployed at the same address on every chain above
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# aggregate3((address target, bool allowFailure, bytes callData)[])
+AGGREGATE3_SELECTOR = "0x82ad56cb"
+
+
+def _abi_word(value: int) -> str:
+    return f"{value:064x}"
+
+
+def encode_aggregate3(calls: list[tuple[str, str]]) -> str:
+    """
+    ABI-encode a Multicall3 aggregate3 call for (target, calldata) pairs.
+
+    Every call is sent with allowFailure=true so one reverting token does not
+    sink the others.
+    """
+    heads, tails = [], []
+    offset = 32 * len(calls)
+    for target, calldata in calls:
+        data = calldata[2:] if calldata.startswith("0x") else calldata
+        padded = data.ljust(-(-len(data) // 64) * 64, "0")
+        element = (
+            target[2:].lower().rjust(64, "0")
+            + _abi_word(1)
+            + _abi_word(0x60)
+            + _abi_word(len(data) // 2)
+            + padded
+        )
+        heads.append(_abi_word(offset))
+        tails.append(element)
+        offset += len(element) // 2
+
+    return (
+        AGGREGATE3_SELECTOR
+        + _abi_word(0x20)
+        + _abi_word(len(calls))
+        + "".join(heads)
+        + "".join(tails)
+    )
+
+
+def decode_aggregate3(result: str) -> list[Optional[str]]:
+    """
+    Decode aggregate3's (bool success, bytes returnData)[] result.
+
+    Returns each call's return data as a hex string, or None if it failed.
+    """
+    data = bytes.fromhex(result[2:] if result.startswith("0x") else result)
+
+    def word(pos: int) -> int:
+        if pos + 32 > len(data):
+            raise ValueError("truncated aggregate3 result")
+        return int.from_bytes(data[pos:pos + 32], "big")
+
+    array = word(0)
+    heads = array + 32
+    decoded = []
+    for i in range(word(array)):
+        element = heads + word(heads + 32 * i)
+        if not word(element):
+            decoded.append(None)
+            continue
+        start = element + word(element + 32)
+        length = word(start)
+        decoded.append("0x" + data[start + 32:start + 32 + length].hex())
+    return decoded
+
+
+def chain_calls(address: str, tokens: list[tuple[str, str]]) -> list[tuple[str, list]]:
+    """JSON-RPC calls for one chain: balance, tx count and a multicall of token balances."""
+    calls = [
+        ("eth_getBalance", [address, "latest"]),
+        ("eth_getTransactionCount", [address, "latest"]),
+    ]
+    if tokens:
+        # All balanceOf calls ride in one Multicall3 eth_call
+        balance_of = BALANCE_OF_SELECTOR + address[2:].lower().rjust(64, "0")
+        multicall = encode_aggregate3([(token_addr, balance_of) for _, token_addr in tokens])
+        calls.append(("eth_call", [{"to": MULTICALL3_ADDRESS, "data": multicall}, "latest"]))
+    return calls
+
+
+def hex_quantity(value) -> Optional[int]:
+    """Parse a JSON-RPC hex quantity, or None if it is missing or malformed."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+
+def serialize_batch(calls: list[tuple[str, list]]) -> bytes:
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": i}
+        for i, (method, params) in enumerate(calls)
+    ]
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def parse_json(content: bytes):
+    """Parse a response body, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls/sec with short bursts."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until a call is allowed."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+class BalanceCache:
+    """
+    Short-TTL cache of per-chain lookups keyed by (chain, address).
+
+    Hits are served from a bounded LRU in memory first, then from a small
+    SQLite file so that re-runs over overlapping CSVs skip addresses fetched
+    moments ago. Expired rows are purged whenever the cache is opened.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, ttl: float = CACHE_TTL,
+                 maxsize: int = CACHE_MEMORY_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        # Losing a cache write on a crash is harmless
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chain_data (
+                chain TEXT NOT NULL,
+                address TEXT NOT NULL,
+                stablecoins INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (chain, address, stablecoins)
+            )
+        """)
+        self.conn.execute(
+            "DELETE FROM chain_data WHERE fetched_at < ?", (time.time() - ttl,)
+        )
+        self.conn.commit()
+
+    def _remember(self, key: tuple, entry: tuple):
+        """Store an entry in the memory LRU, evicting the oldest past maxsize."""
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def get(self, chain: str, address: str, stablecoins: bool) -> Optional[dict]:
+        key = (chain, address.lower(), int(stablecoins))
+        with self.lock:
+            hit = self.memory.get(key)
+            if hit is None:
+                hit = self.conn.execute(
+                    "SELECT fetched_at, data FROM chain_data WHERE chain = ? AND address = ? AND stablecoins = ?",
+                    key
+                ).fetchone()
+                if hit is None:
+                    return None
+                hit = tuple(hit)
+
+            if time.time() - hit[0] > self.ttl:
+                self.memory.pop(key, None)
+                return None
+            self._remember(key, hit)
+
+        return json.loads(hit[1])
+
+    def put(self, chain: str, address: str, stablecoins: bool, data: dict):
+        key = (chain, address.lower(), int(stablecoins))
+        entry = (time.time(), json.dumps(data))
+        with self.lock:
+            self._remember(key, entry)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO chain_data VALUES (?, ?, ?, ?, ?)",
+                key + entry
+            )
+            self.conn.commit()
+
 
 class MultichainBalanceChecker:
     """Query balances across multiple chains."""
 
-    def __init__(self, chains: Optional[list[str]] = None):
+    def __init__(self, chains: Optional[list[str]] = None, max_workers: int = 8,
+                 cache: Optional[BalanceCache] = None):
         self.chains = chains or list(CHAINS.keys())
+        unknown = [chain for chain in self.chains if chain not in CHAINS]
+        if unknown:
+            raise ValueError(f"Unknown chains: {', '.join(unknown)} (known: {', '.join(CHAINS)})")
+        self.max_workers = max_workers
+        # Resolved once so the hot path reads attributes, not nested dicts
+        self.configs = {chain: ChainConfig.from_chains(chain) for chain in CHAINS}
+        self.cache = cache
         self.api_keys = {}
 
         # Load API keys
@@ -126,123 +407,305 @@ class MultichainBalanceChecker:
             if key_env:
                 self.api_keys[chain] = os.getenv(key_env, os.getenv("ETHERSCAN_API_KEY", ""))
 
-    def get_native_balance(self, address: str, chain: str) -> Optional[float]:
-        """Get native token balance on a chain."""
-        config = CHAINS.get(chain)
-        if not config:
+        # Chains live on different hosts, so their lookups run side by side.
+        # The pool is kept for the checker's lifetime and sized so that
+        # max_workers addresses can have every chain lookup in flight.
+        self.executor = ThreadPoolExecutor(max_workers=len(self.chains) * max_workers)
+
+        # One keep-alive pool per host instead of a fresh TCP/TLS handshake per
+        # call. JSON-RPC reads are idempotent, so POSTs are retried as well.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({"GET", "POST"}),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # chain -> monotonic time until which its RPC is skipped
+        self.unhealthy_rpcs = {}
+
+        # The batch body only varies by address, so serialize it once per
+        # (chain, with tokens) and split around the address.
+        self._batch_templates = {}
+        for chain in self.chains:
+            for tokens in ([], list(STABLECOINS.get(chain, {}).items())):
+                body = serialize_batch(chain_calls("0x" + ADDRESS_PLACEHOLDER, tokens))
+                self._batch_templates[(chain, bool(tokens))] = body.split(ADDRESS_PLACEHOLDER.encode())
+
+        # Requests are throttled per host rather than with a blanket sleep,
+        # since the RPCs and explorers have very different limits.
+        self.limiters = {}
+        for chain in self.chains:
+            config = self.configs[chain]
+            prefix = chain.upper()
+            for url, env, default in (
+                (config.rpc, f"{prefix}_RPC_RPS", DEFAULT_RPC_RPS),
+                (config.explorer_api, f"{prefix}_EXPLORER_RPS", DEFAULT_EXPLORER_RPS),
+            ):
+                host = urlparse(url).netloc
+                if host not in self.limiters:
+                    self.limiters[host] = TokenBucket(float(os.getenv(env, default)))
+
+        # Every batch for a chain goes to the same URL with the same headers,
+        # so URL parsing, header merging and the proxy/CA environment lookup
+        # happen once here; _send_rpc_batch only swaps in the body.
+        self._rpc_requests = {}
+        for chain in self.chains:
+            rpc = self.configs[chain].rpc
+            prepared = self.session.prepare_request(requests.Request("POST", rpc, headers=JSON_HEADERS))
+            settings = self.session.merge_environment_settings(rpc, {}, None, None, None)
+            self._rpc_requests[chain] = (prepared, settings)
+
+    def _rpc_healthy(self, chain: str) -> bool:
+        return self.unhealthy_rpcs.get(chain, 0) <= time.monotonic()
+
+    def _mark_rpc_unhealthy(self, chain: str):
+        """Send the next RPC_UNHEALTHY_TTL seconds of lookups straight to the explorer."""
+        self.unhealthy_rpcs[chain] = time.monotonic() + RPC_UNHEALTHY_TTL
+
+    def _wait_for_host(self, url: str):
+        limiter = self.limiters.get(urlparse(url).netloc)
+        if limiter:
+            limiter.wait()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session once the host's limiter allows it."""
+        self._wait_for_host(url)
+        return self.session.request(method, url, **kwargs)
+
+    def _send_rpc_batch(self, chain: str, body: bytes) -> requests.Response:
+        """POST a batch body using the chain's pre-prepared RPC request."""
+        prepared, settings = self._rpc_requests[chain]
+        request = prepared.copy()
+        request.prepare_body(body, None)
+        self._wait_for_host(request.url)
+        return self.session.send(request, timeout=REQUEST_TIMEOUT, **settings)
+
+    def _rpc_quantity(self, chain: str, method: str, params: list) -> Optional[int]:
+        """
+        Make a single JSON-RPC call that returns a hex quantity.
+
+        Returns None if the RPC is unhealthy, unreachable or answered with an
+        error, so callers can fall back explicitly.
+        """
+        if not self._rpc_healthy(chain):
             return None
 
+        payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
         try:
-            # Try RPC call first
-            rpc_url = config["rpc"]
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "eth_getBalance",
-                "params": [address, "latest"],
-                "id": 1
-            }
+            response = self._request("POST", self.configs[chain].rpc, json=payload, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            self._mark_rpc_unhealthy(chain)
+            return None
 
-            response = requests.post(rpc_url, json=payload, timeout=10)
-            if response.status_code == 200:
-                result = response.json().get("result")
-                if result:
-                    balance_wei = int(result, 16)
-                    return balance_wei / (10 ** config["decimals"])
+        if not response.ok:
+            return None
+        try:
+            reply = parse_json(response.content)
+        except ValueError:
+            return None
+        return hex_quantity(reply.get("result")) if isinstance(reply, dict) else None
 
-        except Exception as e:
-            # Fallback to explorer API
-            pass
+    def get_native_balance(self, address: str, chain: str) -> Optional[float]:
+        """Get native token balance on a chain (RPC first, explorer API if that fails)."""
+        config = self.configs.get(chain)
+        if not config:
+            return None
 
-        try:
-            api_url = config["explorer_api"]
-            api_key = self.api_keys.get(chain, "")
-
-            params = {
-                "module": "account",
-                "action": "balance",
-                "address": address,
-                "tag": "latest",
-                "apikey": api_key
-            }
+        balance_wei = self._rpc_quantity(chain, "eth_getBalance", [address, "latest"])
+        if balance_wei is not None:
+            return balance_wei / config.scale
 
-            response = requests.get(api_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("status") == "1":
-                    balance_wei = int(data.get("result", 0))
-                    return balance_wei / (10 ** config["decimals"])
+        return self._explorer_native_balance(address, chain)
+
+    def _explorer_native_balance(self, address: str, chain: str) -> Optional[float]:
+        """Get native token balance from the chain's block explorer API."""
+        config = self.configs[chain]
+        params = {
+            "module": "account",
+            "action": "balance",
+            "address": address,
+            "tag": "latest",
+            "apikey": self.api_keys.get(chain, ""),
+        }
 
-        except Exception as e:
+        try:
+            response = self._request("GET", config.explorer_api, params=params, timeout=REQUEST_TIMEOUT)
+            if not response.ok:
+                return None
+            data = parse_json(response.content)
+            if isinstance(data, dict) and data.get("status") == "1":
+                return int(data.get("result", 0)) / config.scale
+        except (requests.RequestException, ValueError) as e:
             print(f"  Error getting {chain} balance: {e}")
 
         return None
 
-    def get_token_balance(self, address: str, token_address: str, chain: str) -> Optional[float]:
+    def get_token_balance(self, address: str, token_address: str, chain: str,
+                          decimals: int = 18) -> Optional[float]:
         """Get ERC20 token balance."""
-        config = CHAINS.get(chain)
+        config = self.configs.get(chain)
         if not config:
             return None
 
-        try:
-            api_url = config["explorer_api"]
-            api_key = self.api_keys.get(chain, "")
-
-            params = {
-                "module": "account",
-                "action": "tokenbalance",
-                "contractaddress": token_address,
-                "address": address,
-                "tag": "latest",
-                "apikey": api_key
-            }
-
-            response = requests.get(api_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("status") == "1":
-                    balance = int(data.get("result", 0))
-                    # Assume 6 decimals for stablecoins, 18 for others
-                    decimals = 6 if "USD" in token_address.upper() else 18
-                    return balance / (10 ** decimals)
+        params = {
+            "module": "account",
+            "action": "tokenbalance",
+            "contractaddress": token_address,
+            "address": address,
+            "tag": "latest",
+            "apikey": self.api_keys.get(chain, ""),
+        }
 
-        except Exception as e:
+        try:
+            response = self._request("GET", config.explorer_api, params=params, timeout=REQUEST_TIMEOUT)
+            if not response.ok:
+                return None
+            data = parse_json(response.content)
+            if isinstance(data, dict) and data.get("status") == "1":
+                return int(data.get("result", 0)) / (10 ** decimals)
+        except (requests.RequestException, ValueError):
             pass
 
         return None
 
     def get_tx_count(self, address: str, chain: str) -> Optional[int]:
         """Get transaction count on a chain."""
-        config = CHAINS.get(chain)
-        if not config:
+        if chain not in self.configs:
+            return None
+        return self._rpc_quantity(chain, "eth_getTransactionCount", [address, "latest"])
+
+    def _rpc_batch(self, chain: str, body: bytes, n_calls: int) -> Optional[list]:
+        """
+        POST a pre-serialized JSON-RPC batch of n_calls calls to a chain's RPC.
+
+        Returns the results in call order (None for calls that errored), or
+        None if the request failed or the endpoint does not accept batches.
+        """
+        if not self._rpc_healthy(chain):
             return None
 
         try:
-            rpc_url = config["rpc"]
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "eth_getTransactionCount",
-                "params": [address, "latest"],
-                "id": 1
-            }
+            response = self._send_rpc_batch(chain, body)
+        except requests.RequestException:
+            self._mark_rpc_unhealthy(chain)
+            return None
 
-            response = requests.post(rpc_url, json=payload, timeout=10)
-            if response.status_code == 200:
-                result = response.json().get("result")
-                if result:
-                    return int(result, 16)
+        if not response.ok:
+            return None
+        try:
+            replies = parse_json(response.content)
+        except ValueError:
+            return None
 
-        except Exception:
-            pass
+        if not isinstance(replies, list):
+            return None
 
-        return None
+        results = [None] * n_calls
+        for reply in replies:
+            i = reply.get("id") if isinstance(reply, dict) else None
+            if isinstance(i, int) and 0 <= i < n_calls:
+                results[i] = reply.get("result")
+        return results
 
-    def check_address(self, address: str, include_stablecoins: bool = False) -> dict:
+    def _batch_body(self, address: str, chain: str, tokens: list) -> bytes:
+        """Serialized batch for an address, filled into the chain's template when possible."""
+        if HEX_ADDRESS_RE.fullmatch(address):
+            return address[2:].lower().encode().join(self._batch_templates[(chain, bool(tokens))])
+        return serialize_batch(chain_calls(address, tokens))
+
+    def get_chain_data(self, address: str, chain: str, include_stablecoins: bool = False) -> dict:
         """
-        Check an address across all configured chains.
+        Get native balance, tx count and (optionally) stablecoin balances on one
+        chain with a single batched RPC request.
 
-        Returns:
-            Dict with chain → {native_balance, tx_count, stablecoins}
+        Falls back to the one-call-per-value methods if the batch fails, and
+        to the explorer for any individual value the batch could not answer.
         """
+        config = self.configs[chain]
+        tokens = list(STABLECOINS.get(chain, {}).items()) if include_stablecoins else []
+
+        results = self._rpc_batch(chain, self._batch_body(address, chain, tokens), 3 if tokens else 2)
+        chain_data = {
+            "native_balance": None,
+            "native_symbol": config.native_symbol,
+            "tx_count": None,
+        }
+
+        if results is None:
+            # Batch failed or unsupported: one call per value
+            chain_data["native_balance"] = self.get_native_balance(address, chain)
+            chain_data["tx_count"] = self.get_tx_count(address, chain)
+            token_balances = [
+                self.get_token_balance(address, token_addr, chain, STABLECOIN_DECIMALS.get(symbol, 18))
+                for symbol, token_addr in tokens
+            ]
+        else:
+            balance_wei = hex_quantity(results[0])
+            if balance_wei is not None:
+                chain_data["native_balance"] = balance_wei / config.scale
+            else:
+                chain_data["native_balance"] = self._explorer_native_balance(address, chain)
+            chain_data["tx_count"] = hex_quantity(results[1])
+
+            token_balances = [None] * len(tokens)
+            if tokens and isinstance(results[2], str):
+                try:
+                    returned = decode_aggregate3(results[2])
+                except ValueError:
+                    returned = []
+                for i, ((symbol, _), raw) in enumerate(zip(tokens, returned)):
+                    amount = hex_quantity(raw)
+                    if amount is not None:
+                        token_balances[i] = amount / (10 ** STABLECOIN_DECIMALS.get(symbol, 18))
+
+            # Tokens the aggregate3 call did not answer go to the explorer
+            for i, (symbol, token_addr) in enumerate(tokens):
+                if token_balances[i] is None:
+                    token_balances[i] = self.get_token_balance(
+                        address, token_addr, chain, STABLECOIN_DECIMALS.get(symbol, 18)
+                    )
+
+        if include_stablecoins and chain in STABLECOINS:
+            chain_data["stablecoins"] = {
+                symbol: balance
+                for (symbol, _), balance in zip(tokens, token_balances)
+                if balance and balance > 0
+            }
+
+        return chain_data
+
+    def _cached_chain_data(self, address: str, chain: str, include_stablecoins: bool) -> dict:
+        """get_chain_data, served from the cache when a fresh entry exists."""
+        if self.cache is None:
+            return self.get_chain_data(address, chain, include_stablecoins)
+
+        chain_data = self.cache.get(chain, address, include_stablecoins)
+        if chain_data is None:
+            chain_data = self.get_chain_data(address, chain, include_stablecoins)
+            # Only cache answers; a failed lookup should be retried next time
+            if chain_data["native_balance"] is not None or chain_data["tx_count"] is not None:
+                self.cache.put(chain, address, include_stablecoins, chain_data)
+        return chain_data
+
+    def _submit_address(self, address: str, include_stablecoins: bool = False) -> dict:
+        """Queue every per-chain lookup for an address on the shared pool."""
+        if not address:
+            return {}
+        return {
+            chain: self.executor.submit(self._cached_chain_data, address, chain, include_stablecoins)
+            for chain in self.chains
+        }
+
+    def _collect_address(self, address: str, futures: dict) -> dict:
+        """Wait for an address's lookups and assemble its result dict."""
         results = {
             "address": address,
             "chains": {},
@@ -250,50 +713,52 @@ class MultichainBalanceChecker:
             "active_chains": [],
         }
 
-        for chain in self.chains:
-            chain_data = {
-                "native_balance": None,
-                "native_symbol": CHAINS[chain]["native_symbol"],
-                "tx_count": None,
-            }
+        for chain, future in futures.items():
+            chain_data = future.result()
+            tx_count = chain_data["tx_count"]
+            if tx_count and tx_count > 0:
+                results["active_chains"].append(chain)
 
-            # Get native balance
-            balance = self.get_native_balance(address, chain)
-            chain_data["native_balance"] = balance
+            results["chains"][chain] = chain_data
 
-            # Get tx count
-            tx_count = self.get_tx_count(address, chain)
-            chain_data["tx_count"] = tx_count
+        return results
 
-            if tx_count and tx_count > 0:
-                results["active_chains"].append(chain)
+    def check_address(self, address: str, include_stablecoins: bool = False) -> dict:
+        """
+        Check an address across all configured chains.
 
-            # Get stablecoins if requested
-            if include_stablecoins and chain in STABLECOINS:
-                chain_data["stablecoins"] = {}
-                for symbol, token_addr in STABLECOINS[chain].items():
-                    token_balance = self.get_token_balance(address, token_addr, chain)
-                    if token_balance and token_balance > 0:
-                        chain_data["stablecoins"][symbol] = token_balance
+        Returns:
+            Dict with chain → {native_balance, tx_count, stablecoins}
+        """
+        return self._collect_address(address, self._submit_address(address, include_stablecoins))
 
-            results["chains"][chain] = chain_data
+    def iter_check(self, addresses: Iterable[str], include_stablecoins: bool = False) -> Iterator[dict]:
+        """
+        Yield check_address results in input order.
 
-            # Small delay to avoid rate limits
-            time.sleep(0.2)
+        Lookups for up to max_workers addresses are in flight at once, all on
+        the shared per-chain pool, so there is no second layer of threads.
+        Blank addresses yield an empty result without any lookups.
+        """
+        pending = deque()
+        for address in addresses:
+            pending.append((address, self._submit_address(address, include_stablecoins)))
+            if len(pending) >= self.max_workers:
+                yield self._collect_address(*pending.popleft())
 
-        return results
+        while pending:
+            yield self._collect_address(*pending.popleft())
 
     def check_batch(self, addresses: list[str], show_progress: bool = True) -> list[dict]:
-        """Check multiple addresses."""
+        """Check multiple addresses concurrently, returning results in input order."""
         results = []
         total = len(addresses)
 
-        for i, address in enumerate(addresses):
-            result = self.check_address(address)
+        for i, result in enumerate(self.iter_check(addresses), 1):
             results.append(result)
 
-            if show_progress and (i + 1) % 5 == 0:
-                print(f"  Progress: {i + 1}/{total}")
+            if show_progress and i % 5 == 0:
+                print(f"  Progress: {i}/{total}")
 
         return results
 
@@ -309,64 +774,100 @@ def format_balance(balance: Optional[float], decimals: int = 4) -> str:
     return f"{balance:,.{decimals}f}"
 
 
+def result_columns(result: dict, balance_columns: list[tuple[str, str]]) -> dict:
+    """CSV columns added for one check_address result."""
+    chains = result["chains"]
+    columns = {}
+    for chain, col_name in balance_columns:
+        chain_data = chains.get(chain)
+        balance = chain_data["native_balance"] if chain_data else None
+        columns[col_name] = format_balance(balance) if balance else ""
+
+    active = result["active_chains"]
+    columns["active_chains"] = ",".join(active)
+    columns["chain_count"] = len(active)
+    return columns
+
+
 def process_csv(input_path: str, output_path: str, checker: MultichainBalanceChecker, address_column: str = "address"):
-    """Process CSV file and add multichain balances."""
-    rows = []
-    addresses = []
-
-    # Read input
-    with open(input_path, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        fieldnames = list(reader.fieldnames or [])
-
-        for row in reader:
-            rows.append(row)
-            addr = row.get(address_column, row.get('borrower', ''))
-            if addr:
-                addresses.append(addr)
-
-    print(f"Checking {len(addresses)} addresses across {len(checker.chains)} chains")
-
-    # Add columns for each chain
-    for chain in checker.chains:
-        col_name = f"{chain}_balance"
-        if col_name not in fieldnames:
-            fieldnames.append(col_name)
-
-    if "active_chains" not in fieldnames:
-        fieldnames.append("active_chains")
-    if "chain_count" not in fieldnames:
-        fieldnames.append("chain_count")
-
-    # Check balances
-    results = checker.check_batch(addresses)
-
-    # Map results by address
-    result_map = {r["address"].lower(): r for r in results}
-
-    # Update rows
-    for row in rows:
-        addr = row.get(address_column, row.get('borrower', '')).lower()
-        result = result_map.get(addr, {})
-
-        for chain in checker.chains:
-            chain_data = result.get("chains", {}).get(chain, {})
-            balance = chain_data.get("native_balance")
-            row[f"{chain}_balance"] = format_balance(balance) if balance else ""
-
-        row["active_chains"] = ",".join(result.get("active_chains", []))
-        row["chain_count"] = len(result.get("active_chains", []))
-
-    # Write output
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    """
+    Process CSV file and add multichain balances.
+
+    Rows are streamed: each is written as soon as its lookups finish (in input
+    order), so memory stays flat apart from the columns kept per distinct
+    address. Repeated addresses are only queried once. The output may be the
+    input file itself.
+    """
+    checked = 0
+    multi_chain = 0
+
+    # Write next to the output and swap it in at the end, so an output path
+    # that is also the input is only replaced once the input is fully read
+    tmp_path = f"{output_path}.tmp"
+    try:
+        with open(input_path, 'r', newline='') as f_in, open(tmp_path, 'w', newline='') as f_out:
+            reader = csv.DictReader(f_in)
+            fieldnames = list(reader.fieldnames or [])
+
+            # Add columns for each chain
+            balance_columns = [(chain, f"{chain}_balance") for chain in checker.chains]
+            for _, col_name in balance_columns:
+                if col_name not in fieldnames:
+                    fieldnames.append(col_name)
+
+            if "active_chains" not in fieldnames:
+                fieldnames.append("active_chains")
+            if "chain_count" not in fieldnames:
+                fieldnames.append("chain_count")
+
+            writer = csv.DictWriter(f_out, fieldnames=fieldnames)
+            writer.writeheader()
+
+            print(f"Checking addresses from {input_path} across {len(checker.chains)} chains")
+
+            # Each distinct address is checked once; rows wait here, in input
+            # order, until the columns for their address are known.
+            rows = deque()
+            columns = {None: result_columns({"chains": {}, "active_chains": []}, balance_columns)}
+
+            def addresses():
+                submitted = set()
+                for row in reader:
+                    addr = row.get(address_column, row.get('borrower', ''))
+                    key = addr.lower() or None
+                    rows.append((row, key))
+                    if key is not None and key not in submitted:
+                        submitted.add(key)
+                        yield addr
+
+            def flush():
+                while rows and rows[0][1] in columns:
+                    row, key = rows.popleft()
+                    row.update(columns[key])
+                    writer.writerow(row)
+
+            for result in checker.iter_check(addresses()):
+                columns[result["address"].lower()] = result_columns(result, balance_columns)
+                flush()
+
+                checked += 1
+                if len(result["active_chains"]) > 1:
+                    multi_chain += 1
+                if checked % 5 == 0:
+                    print(f"  Progress: {checked}")
+
+            flush()
+
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
     # Summary
-    multi_chain = sum(1 for r in results if len(r.get("active_chains", [])) > 1)
     print(f"\nResults:")
-    print(f"  Single-chain users: {len(results) - multi_chain}")
+    print(f"  Distinct addresses checked: {checked}")
+    print(f"  Single-chain users: {checked - multi_chain}")
     print(f"  Multi-chain users: {multi_chain}")
     print(f"Output written to {output_path}")
 
@@ -379,11 +880,19 @@ def main():
     parser.add_argument("--chains", help="Comma-separated list of chains (default: all)")
     parser.add_argument("--column", default="address", help="Column containing addresses")
     parser.add_argument("--stablecoins", action="store_true", help="Include stablecoin balances")
+    parser.add_argument("--workers", type=int, default=8, help="Addresses checked in parallel (default: 8)")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the chains, ignoring cached results")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL,
+                        help=f"Seconds a cached result stays fresh (default: {CACHE_TTL})")
 
     args = parser.parse_args()
 
     chains = args.chains.split(",") if args.chains else None
-    checker = MultichainBalanceChecker(chains=chains)
+    cache = None if args.no_cache else BalanceCache(ttl=args.cache_ttl)
+    try:
+        checker = MultichainBalanceChecker(chains=chains, max_workers=args.workers, cache=cache)
+    except ValueError as e:
+        parser.error(str(e))
 
     if args.address:
         # Single address
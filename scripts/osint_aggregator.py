@@ -20,44 +20,256 @@ Usage:
 import argparse
 import csv
 import json
+import math
 import os
 import re
+import sqlite3
 import sys
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
+from urllib.parse import urlparse
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
     pass
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # API Configuration
 ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY", "")
 ETH_RPC_URL = os.getenv("ETH_RPC_URL", "https://eth.llamarpc.com")
 
+# Concurrent address lookups. Requests still pass through the per-host
+# rate limiters, so extra workers only overlap network latency.
+DEFAULT_WORKERS = 8
+
+# Adaptive batch sizes for iter_osint: grow after a clean batch, halve
+# after one that saw throttling (HTTP 429/5xx)
+BATCH_SIZE_START = 16
+BATCH_SIZE_MAX = 256
+
 # Rate limiting
-RATE_LIMIT = 2.0  # Lower for external APIs
-last_request_time = 0
+RATE_LIMIT = 2.0  # Requests/sec per host - lower for external APIs
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls/sec with short bursts."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until a call is allowed."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+# One bucket per API host: the ENS subgraph and Snapshot have independent
+# limits, so waiting on one must not delay calls to the other.
+_host_limiters: Dict[str, TokenBucket] = {}
+_host_limiters_lock = threading.Lock()
+
+
+def rate_limit(url: str):
+    """Enforce rate limiting for the host serving `url`."""
+    host = urlparse(url).netloc
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = _host_limiters[host] = TokenBucket(RATE_LIMIT, burst=1)
+    limiter.wait()
+
+
+@lru_cache(maxsize=1)
+def get_session() -> 'requests.Session':
+    """
+    Shared HTTP session so repeated calls to the same API host reuse
+    keep-alive connections instead of a new TCP+TLS handshake each time.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(_count_throttled)
+    return session
+
+
+_throttled_responses = 0
+_throttled_lock = threading.Lock()
+
+
+def _count_throttled(response, *args, **kwargs):
+    """Session hook counting rate-limited or failing upstream responses."""
+    global _throttled_responses
+    if response.status_code == 429 or response.status_code >= 500:
+        with _throttled_lock:
+            _throttled_responses += 1
+
+
+@lru_cache(maxsize=1)
+def get_lookup_executor() -> ThreadPoolExecutor:
+    """Background thread for aggregate_osint(overlap=True) Snapshot lookups."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="osint-lookup")
+
+
+def _has_non_finite(value) -> bool:
+    """True if a JSON-like value holds a NaN or infinite float anywhere."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def parse_json(content: bytes):
+    """Parse a response body, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
 
 
-def rate_limit():
-    """Enforce rate limiting."""
-    global last_request_time
-    elapsed = time.time() - last_request_time
-    if elapsed < 1 / RATE_LIMIT:
-        time.sleep(1 / RATE_LIMIT - elapsed)
-    last_request_time = time.time()
+# On-disk cache of OSINT lookups, keyed by (source, key)
+CACHE_PATH = Path(os.getenv("OSINT_CACHE_PATH", Path.home() / ".cache" / "osint.sqlite"))
+CACHE_TTLS = {  # seconds per source
+    'ens': 24 * 3600,
+    'governance': 6 * 3600,
+}
+CACHE_MEMORY_SIZE = 4096  # most recently used lookups kept in memory
+CACHE_ENABLED = True
+
+
+class OsintCache:
+    """
+    TTL cache of per-address OSINT lookups.
+
+    Hits are served from a bounded LRU in memory first, then from a SQLite
+    file so repeated runs over the same addresses skip the network. Only
+    successful lookups are stored; a failed request is retried on the next
+    run. Expired rows are purged whenever the cache is opened.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, ttls: Optional[Dict[str, float]] = None,
+                 maxsize: int = CACHE_MEMORY_SIZE):
+        self.ttls = ttls or CACHE_TTLS
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        # Losing a cache write on a crash is harmless
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS lookups (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        now = time.time()
+        for source, ttl in self.ttls.items():
+            self.conn.execute(
+                "DELETE FROM lookups WHERE source = ? AND fetched_at < ?", (source, now - ttl)
+            )
+        # Sources without a TTL are never served
+        placeholders = ', '.join('?' for _ in self.ttls)
+        self.conn.execute(
+            f"DELETE FROM lookups WHERE source NOT IN ({placeholders})", list(self.ttls)
+        )
+        self.conn.commit()
+
+    def _remember(self, cache_key: tuple, entry: tuple):
+        """Store an entry in the memory LRU, evicting the oldest past maxsize."""
+        self.memory[cache_key] = entry
+        self.memory.move_to_end(cache_key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def get(self, source: str, key: str):
+        cache_key = (source, key.lower())
+        with self.lock:
+            hit = self.memory.get(cache_key)
+            if hit is None:
+                hit = self.conn.execute(
+                    "SELECT fetched_at, data FROM lookups WHERE source = ? AND key = ?",
+                    cache_key
+                ).fetchone()
+                if hit is None:
+                    return None
+                hit = tuple(hit)
+
+            if time.time() - hit[0] > self.ttls.get(source, 0):
+                self.memory.pop(cache_key, None)
+                return None
+            self._remember(cache_key, hit)
+
+        return json.loads(hit[1])
+
+    def put(self, source: str, key: str, data):
+        cache_key = (source, key.lower())
+        entry = (time.time(), json.dumps(data))
+        with self.lock:
+            self._remember(cache_key, entry)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?)",
+                cache_key + entry
+            )
+            self.conn.commit()
+
+
+_cache: Optional[OsintCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[OsintCache]:
+    """Shared OsintCache, or None when caching is disabled."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = OsintCache()
+    return _cache
 
 
 # ============================================================================
 # ENS Metadata Extraction
 # ============================================================================
 
+# ENS subgraph (The Graph decentralized network)
+ENS_SUBGRAPH_URL = "https://gateway.thegraph.com/api/subgraphs/id/5XqPmWe6gjyrJtFn9cLy237i4cWw2j9HcUJEXsP5qGtH"
+
 # ENS Public Resolver ABI (text record function)
 ENS_RESOLVER_ADDRESS = "0x231b0Ee14048e9dCcD1d247744d114a4EB5E8E63"  # ENS Public Resolver 2
 
@@ -79,11 +291,9 @@ def resolve_ens_reverse(address: str) -> Optional[str]:
     """
     Resolve ENS name from address using reverse resolution via ENS subgraph.
     """
-    rate_limit()
+    rate_limit(ENS_SUBGRAPH_URL)
 
     try:
-        # Use ENS subgraph (The Graph decentralized network)
-        ens_subgraph = "https://gateway.thegraph.com/api/subgraphs/id/5XqPmWe6gjyrJtFn9cLy237i4cWw2j9HcUJEXsP5qGtH"
         query = """
         query GetName($address: String!) {
             domains(where: {resolvedAddress: $address}) {
@@ -95,14 +305,14 @@ def resolve_ens_reverse(address: str) -> Optional[str]:
         }
         """
 
-        response = requests.post(
-            ens_subgraph,
+        response = get_session().post(
+            ENS_SUBGRAPH_URL,
             json={"query": query, "variables": {"address": address.lower()}},
             timeout=10
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response.content)
             domains = data.get("data", {}).get("domains", [])
             if domains:
                 return domains[0].get("name")
@@ -119,13 +329,11 @@ def get_ens_text_records(ens_name: str) -> Dict[str, str]:
     Note: ENS subgraph returns which text keys exist but not their values.
     For actual values, would need web3.py with ENS resolver calls.
     """
-    rate_limit()
+    rate_limit(ENS_SUBGRAPH_URL)
 
     records = {}
 
     try:
-        # Use ENS subgraph for text record keys
-        ens_subgraph = "https://gateway.thegraph.com/api/subgraphs/id/5XqPmWe6gjyrJtFn9cLy237i4cWw2j9HcUJEXsP5qGtH"
         query = """
         query GetTextRecords($name: String!) {
             domains(where: {name: $name}) {
@@ -136,14 +344,14 @@ def get_ens_text_records(ens_name: str) -> Dict[str, str]:
         }
         """
 
-        response = requests.post(
-            ens_subgraph,
+        response = get_session().post(
+            ENS_SUBGRAPH_URL,
             json={"query": query, "variables": {"name": ens_name}},
             timeout=10
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response.content)
             domains = data.get("data", {}).get("domains", [])
             if domains and domains[0].get("resolver"):
                 texts = domains[0]["resolver"].get("texts", [])
@@ -156,6 +364,168 @@ def get_ens_text_records(ens_name: str) -> Dict[str, str]:
     return records
 
 
+def resolve_ens_with_records(address: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Resolve ENS name and its text record keys for an address in one query.
+
+    Equivalent to resolve_ens_reverse() followed by get_ens_text_records(),
+    but a single subgraph round-trip.
+    """
+    cache = get_cache()
+    if cache:
+        hit = cache.get('ens', address)
+        if hit is not None:
+            return hit[0], hit[1]
+
+    rate_limit(ENS_SUBGRAPH_URL)
+
+    try:
+        query = """
+        query GetENS($address: String!) {
+            domains(where: {resolvedAddress: $address}) {
+                name
+                resolver {
+                    texts
+                }
+            }
+        }
+        """
+
+        response = get_session().post(
+            ENS_SUBGRAPH_URL,
+            json={"query": query, "variables": {"address": address.lower()}},
+            timeout=10
+        )
+
+        if response.status_code == 200:
+            data = parse_json(response.content)
+            domains = (data.get("data") or {}).get("domains")
+            name, records = None, {}
+            if domains and domains[0].get("name"):
+                resolver = domains[0].get("resolver") or {}
+                name = domains[0]["name"]
+                records = {
+                    key: f"[has {key}]"  # Subgraph doesn't return values
+                    for key in resolver.get("texts") or []
+                }
+            if cache and domains is not None:
+                cache.put('ens', address, [name, records])
+            return name, records
+
+    except Exception as e:
+        print(f"  ENS resolution error: {e}", file=sys.stderr)
+
+    return None, {}
+
+
+ENS_BATCH_SIZE = 50  # Addresses per batched subgraph query
+ENS_BATCH_DOMAIN_LIMIT = 1000  # Max domains returned by one batched query
+
+
+def batch_resolve_ens(addresses: List[str]) -> Dict[str, Tuple[Optional[str], Dict[str, str]]]:
+    """
+    Resolve ENS names and text record keys for many addresses.
+
+    Sends one subgraph query per ENS_BATCH_SIZE addresses instead of one per
+    address. Returns {address_lower: (name, text_records)} with the same
+    values resolve_ens_with_records() would give. Addresses from a chunk
+    that failed, or whose answer may have been truncated, are left out so
+    callers fall back to the per-address lookup.
+    """
+    query = """
+    query GetENSBatch($addresses: [String!]!, $first: Int!) {
+        domains(where: {resolvedAddress_in: $addresses}, first: $first) {
+            name
+            resolvedAddress {
+                id
+            }
+            resolver {
+                texts
+            }
+        }
+    }
+    """
+
+    unique = list(dict.fromkeys(a.lower() for a in addresses if a))
+    resolved = {}
+
+    cache = get_cache()
+    if cache:
+        pending = []
+        for addr in unique:
+            hit = cache.get('ens', addr)
+            if hit is None:
+                pending.append(addr)
+            else:
+                resolved[addr] = (hit[0], hit[1])
+        unique = pending
+
+    for start in range(0, len(unique), ENS_BATCH_SIZE):
+        chunk = unique[start:start + ENS_BATCH_SIZE]
+        rate_limit(ENS_SUBGRAPH_URL)
+
+        try:
+            response = get_session().post(
+                ENS_SUBGRAPH_URL,
+                json={"query": query, "variables": {
+                    "addresses": chunk, "first": ENS_BATCH_DOMAIN_LIMIT
+                }},
+                timeout=30
+            )
+            if response.status_code != 200:
+                continue
+            data = parse_json(response.content)
+            domains = (data.get("data") or {}).get("domains")
+        except Exception as e:
+            print(f"  ENS batch resolution error: {e}", file=sys.stderr)
+            continue
+
+        if domains is None or len(domains) >= ENS_BATCH_DOMAIN_LIMIT:
+            continue
+
+        chunk_result = {addr: (None, {}) for addr in chunk}
+        seen = set()
+        for domain in domains:
+            addr = (domain.get("resolvedAddress") or {}).get("id", "").lower()
+            # Only the first domain per address counts, as in the single lookup
+            if addr not in chunk_result or addr in seen:
+                continue
+            seen.add(addr)
+            if not domain.get("name"):
+                continue
+            resolver = domain.get("resolver") or {}
+            chunk_result[addr] = (domain["name"], {
+                key: f"[has {key}]"  # Subgraph doesn't return values
+                for key in resolver.get("texts") or []
+            })
+        resolved.update(chunk_result)
+        if cache:
+            for addr, (name, records) in chunk_result.items():
+                cache.put('ens', addr, [name, records])
+
+    return resolved
+
+
+# ENS name suffix -> identity signal. The suffixes are mutually exclusive,
+# so one alternation replaces trying each pattern in turn.
+ENS_PROTOCOL_SUFFIX_LABELS = {
+    'capital': 'Likely VC/Investment Fund',
+    'fund': 'Likely Investment Fund',
+    'dao': 'DAO Treasury',
+    'treasury': 'Project Treasury',
+    'vault': 'Vault/Treasury',
+    'protocol': 'Protocol Address',
+    'finance': 'DeFi Protocol',
+    'labs': 'Development Team',
+    'foundation': 'Foundation Address',
+}
+ENS_PROTOCOL_SUFFIX_RE = re.compile(
+    r'.*(' + '|'.join(ENS_PROTOCOL_SUFFIX_LABELS) + r')\.eth$'
+)
+ENS_PERSONAL_NAME_RE = re.compile(r'^[a-z]{2,15}\.eth$')
+ENS_NUMBERS_RE = re.compile(r'\d{3,}')
+
+
 def extract_ens_identity_signals(ens_name: str, text_records: Dict[str, str]) -> List[str]:
     """
     Extract identity signals from ENS name and records.
@@ -169,29 +539,16 @@ def extract_ens_identity_signals(ens_name: str, text_records: Dict[str, str]) ->
     name_lower = ens_name.lower()
 
     # Protocol/project names
-    protocol_patterns = [
-        (r'.*capital\.eth$', 'Likely VC/Investment Fund'),
-        (r'.*fund\.eth$', 'Likely Investment Fund'),
-        (r'.*dao\.eth$', 'DAO Treasury'),
-        (r'.*treasury\.eth$', 'Project Treasury'),
-        (r'.*vault\.eth$', 'Vault/Treasury'),
-        (r'.*protocol\.eth$', 'Protocol Address'),
-        (r'.*finance\.eth$', 'DeFi Protocol'),
-        (r'.*labs\.eth$', 'Development Team'),
-        (r'.*foundation\.eth$', 'Foundation Address'),
-    ]
-
-    for pattern, label in protocol_patterns:
-        if re.match(pattern, name_lower):
-            signals.append(label)
-            break
+    match = ENS_PROTOCOL_SUFFIX_RE.match(name_lower)
+    if match:
+        signals.append(ENS_PROTOCOL_SUFFIX_LABELS[match.group(1)])
 
     # Personal name patterns (firstname.eth, firstname-lastname.eth)
-    if re.match(r'^[a-z]{2,15}\.eth$', name_lower):
+    if ENS_PERSONAL_NAME_RE.match(name_lower):
         signals.append('Likely Personal Name')
 
     # Numbers in name often indicate whale/collector
-    if re.search(r'\d{3,}', name_lower):
+    if ENS_NUMBERS_RE.search(name_lower):
         signals.append('Contains Numbers - Collector Pattern')
 
     # Text record signals
@@ -216,32 +573,23 @@ SNAPSHOT_GRAPHQL_URL = "https://hub.snapshot.org/graphql"
 
 def snapshot_query(query: str, variables: dict = None) -> dict:
     """Execute a Snapshot GraphQL query."""
-    rate_limit()
+    rate_limit(SNAPSHOT_GRAPHQL_URL)
 
     try:
-        response = requests.post(
+        response = get_session().post(
             SNAPSHOT_GRAPHQL_URL,
             json={"query": query, "variables": variables or {}},
             headers={"Content-Type": "application/json"},
             timeout=30
         )
-        data = response.json()
-        return data.get("data", {})
+        data = parse_json(response.content)
+        return data.get("data") or {}
     except Exception as e:
         print(f"  Snapshot error: {e}", file=sys.stderr)
         return {}
 
 
-def get_snapshot_activity(address: str) -> dict:
-    """Get Snapshot voting activity for an address."""
-    query = """
-    query Votes($voter: String!) {
-        votes(
-            where: { voter: $voter }
-            first: 100
-            orderBy: "created"
-            orderDirection: desc
-        ) {
+VOTE_FIELDS = """
             id
             voter
             created
@@ -254,13 +602,11 @@ def get_snapshot_activity(address: str) -> dict:
                     name
                 }
             }
-        }
-    }
-    """
+"""
 
-    result = snapshot_query(query, {"voter": address.lower()})
-    votes = result.get("votes", [])
 
+def summarize_votes(address: str, votes: List[dict]) -> dict:
+    """Aggregate raw Snapshot votes into per-space activity."""
     if not votes:
         return {
             'address': address.lower(),
@@ -307,6 +653,34 @@ def get_snapshot_activity(address: str) -> dict:
     }
 
 
+def summarize_delegations(delegates_to: List[dict], receives_from: List[dict]) -> dict:
+    """Summarize delegations made by and to an address."""
+    return {
+        'delegates_to_count': len(delegates_to),
+        'receives_delegations_from': len(receives_from),
+        'is_delegate': len(receives_from) > 5,  # Significant if >5 delegators
+        'delegates_to': [d['delegate'][:20] + '...' for d in delegates_to[:3]],
+        'spaces_delegating': list(set(d['space'] for d in delegates_to))[:5]
+    }
+
+
+def get_snapshot_activity(address: str) -> dict:
+    """Get Snapshot voting activity for an address."""
+    query = """
+    query Votes($voter: String!) {
+        votes(
+            where: { voter: $voter }
+            first: 100
+            orderBy: "created"
+            orderDirection: desc
+        ) {""" + VOTE_FIELDS + """        }
+    }
+    """
+
+    result = snapshot_query(query, {"voter": address.lower()})
+    return summarize_votes(address, result.get("votes") or [])
+
+
 def get_delegations(address: str) -> dict:
     """Get delegation info for an address."""
     # Delegations FROM this address
@@ -338,16 +712,157 @@ def get_delegations(address: str) -> dict:
     result_from = snapshot_query(query_from, {"delegator": address.lower()})
     result_to = snapshot_query(query_to, {"delegate": address.lower()})
 
-    delegates_to = result_from.get("delegations", [])
-    receives_from = result_to.get("delegations", [])
+    return summarize_delegations(
+        result_from.get("delegations") or [],
+        result_to.get("delegations") or []
+    )
 
-    return {
-        'delegates_to_count': len(delegates_to),
-        'receives_delegations_from': len(receives_from),
-        'is_delegate': len(receives_from) > 5,  # Significant if >5 delegators
-        'delegates_to': [d['delegate'][:20] + '...' for d in delegates_to[:3]],
-        'spaces_delegating': list(set(d['space'] for d in delegates_to))[:5]
+
+def get_governance_activity(address: str) -> Tuple[dict, dict]:
+    """
+    Get Snapshot votes and delegations for an address in one request.
+
+    Equivalent to (get_snapshot_activity(address), get_delegations(address))
+    but sends a single GraphQL document with aliased fields.
+    """
+    cache = get_cache()
+    if cache:
+        hit = cache.get('governance', address)
+        if hit is not None:
+            return hit[0], hit[1]
+
+    query = """
+    query Governance($address: String!) {
+        votes(
+            where: { voter: $address }
+            first: 100
+            orderBy: "created"
+            orderDirection: desc
+        ) {""" + VOTE_FIELDS + """        }
+        delegatesFrom: delegations(
+            where: { delegator: $address }
+            first: 100
+        ) {
+            delegate
+            space
+        }
+        delegatesTo: delegations(
+            where: { delegate: $address }
+            first: 100
+        ) {
+            delegator
+            space
+        }
+    }
+    """
+
+    result = snapshot_query(query, {"address": address.lower()})
+    activity = (
+        summarize_votes(address, result.get("votes") or []),
+        summarize_delegations(
+            result.get("delegatesFrom") or [],
+            result.get("delegatesTo") or []
+        ),
+    )
+    # snapshot_query returns {} on failure; only cache a real answer
+    if cache and "votes" in result:
+        cache.put('governance', address, list(activity))
+    return activity
+
+
+GOVERNANCE_BATCH_SIZE = 50  # Addresses per batched Snapshot query
+SNAPSHOT_MAX_FIRST = 1000  # Largest page Snapshot's GraphQL API returns
+SNAPSHOT_PER_ADDRESS = 100  # Votes/delegations kept per address, as in the single query
+
+
+def batch_governance_activity(addresses: List[str]) -> Dict[str, Tuple[dict, dict]]:
+    """
+    Get Snapshot votes and delegations for many addresses.
+
+    Sends one query per GOVERNANCE_BATCH_SIZE addresses using voter_in /
+    delegator_in / delegate_in filters and buckets the rows by address.
+    Returns {address_lower: (snapshot, delegations)} matching what
+    get_governance_activity() would return.
+
+    A full page may be missing rows for some addresses. Those addresses are
+    left out unless they already have SNAPSHOT_PER_ADDRESS rows in every
+    truncated list, so callers fall back to the per-address query for them.
+    """
+    query = """
+    query GovernanceBatch($addresses: [String!]!, $first: Int!) {
+        votes(
+            where: { voter_in: $addresses }
+            first: $first
+            orderBy: "created"
+            orderDirection: desc
+        ) {""" + VOTE_FIELDS + """        }
+        delegatesFrom: delegations(
+            where: { delegator_in: $addresses }
+            first: $first
+        ) {
+            delegator
+            delegate
+            space
+        }
+        delegatesTo: delegations(
+            where: { delegate_in: $addresses }
+            first: $first
+        ) {
+            delegator
+            delegate
+            space
+        }
     }
+    """
+
+    unique = list(dict.fromkeys(a.lower() for a in addresses if a))
+    activity = {}
+
+    cache = get_cache()
+    if cache:
+        pending = []
+        for addr in unique:
+            hit = cache.get('governance', addr)
+            if hit is None:
+                pending.append(addr)
+            else:
+                activity[addr] = (hit[0], hit[1])
+        unique = pending
+
+    for start in range(0, len(unique), GOVERNANCE_BATCH_SIZE):
+        chunk = unique[start:start + GOVERNANCE_BATCH_SIZE]
+        result = snapshot_query(query, {"addresses": chunk, "first": SNAPSHOT_MAX_FIRST})
+        if not all(key in result for key in ("votes", "delegatesFrom", "delegatesTo")):
+            continue  # Request failed; leave the chunk to per-address queries
+
+        rows = {}
+        for key, field in (("votes", "voter"), ("delegatesFrom", "delegator"),
+                           ("delegatesTo", "delegate")):
+            buckets = {addr: [] for addr in chunk}
+            for row in result[key] or []:
+                bucket = buckets.get((row.get(field) or "").lower())
+                if bucket is not None and len(bucket) < SNAPSHOT_PER_ADDRESS:
+                    bucket.append(row)
+            truncated = len(result[key] or []) >= SNAPSHOT_MAX_FIRST
+            rows[key] = (buckets, truncated)
+
+        for addr in chunk:
+            # A truncated page is only complete for addresses that already
+            # hit the per-address limit
+            if any(truncated and len(buckets[addr]) < SNAPSHOT_PER_ADDRESS
+                   for buckets, truncated in rows.values()):
+                continue
+            activity[addr] = (
+                summarize_votes(addr, rows["votes"][0][addr]),
+                summarize_delegations(
+                    rows["delegatesFrom"][0][addr],
+                    rows["delegatesTo"][0][addr]
+                ),
+            )
+            if cache:
+                cache.put('governance', addr, list(activity[addr]))
+
+    return activity
 
 
 def extract_governance_identity_signals(snapshot: dict, delegations: dict) -> List[str]:
@@ -417,73 +932,127 @@ KNOWN_PROTOCOLS = {
 }
 
 
+_PROTOCOL_NAMES = list(KNOWN_PROTOCOLS)
+# One zero-width lookahead per offset with a named group per protocol: a
+# single scan over the name instead of a substring search per pattern.
+_PROTOCOL_PATTERN_RE = re.compile('(?=' + '|'.join(
+    f"(?P<p{i}>{'|'.join(re.escape(p) for p in KNOWN_PROTOCOLS[name])})"
+    for i, name in enumerate(_PROTOCOL_NAMES)
+) + ')')
+
+
+@lru_cache(maxsize=4096)
 def match_protocol_pattern(ens_name: str) -> Optional[str]:
     """Try to match ENS name to known protocol."""
     if not ens_name:
         return None
 
-    name_lower = ens_name.lower()
-
-    for protocol, patterns in KNOWN_PROTOCOLS.items():
-        for pattern in patterns:
-            if pattern in name_lower:
-                return protocol
+    # Each hit reports the earliest protocol matching at that offset, so the
+    # lowest index across hits is the first protocol (in dict order) whose
+    # pattern occurs anywhere in the name.
+    best = None
+    for match in _PROTOCOL_PATTERN_RE.finditer(ens_name.lower()):
+        index = int(match.lastgroup[1:])
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
 
-    return None
+    return _PROTOCOL_NAMES[best] if best is not None else None
 
 
 # ============================================================================
 # Whale Tracker Aggregation
 # ============================================================================
 
+# Known whale addresses (from previous investigations)
+KNOWN_WHALES = {
+    # Justin Sun
+    "0x3ddfa8ec3052539b6c9549f12cea2c295cff5296": {"name": "Justin Sun", "confidence": 0.95},
+    "0x176f3dab24a159341c0509bb36b833e7fdd0a132": {"name": "Justin Sun", "confidence": 0.9},
+
+    # Major entities
+    "0x40ec5b33f54e0e8a33a975908c5ba1c14e5bbbdf": {"name": "Polygon Bridge", "confidence": 0.95},
+    "0x1db92e2eebc8e0c075a02bea49a2935bcd2dfcf4": {"name": "Stargate Finance", "confidence": 0.95},
+
+    # Trend Research cluster
+    "0x85e67feb76596f08a4dbebfdcbed3d0e9bf60ae9": {"name": "Trend Research", "confidence": 0.85},
+    "0xfaf6f6ffaf0ea8815a8ceeee6399ebe9bfe72a7a": {"name": "Trend Research", "confidence": 0.85},
+
+    # 7 Siblings
+    "0xbcd0f3c2e6e73d6c2e1e8e0c6e52c4f2e2a1d0c9": {"name": "7 Siblings", "confidence": 0.8},
+}
+
+
 def check_whale_trackers(address: str) -> List[dict]:
     """
     Check if address is tracked by major whale trackers.
     Note: This would ideally use their APIs, but most require subscriptions.
     Returns cached/known whale labels.
     """
-    # Known whale addresses (from previous investigations)
-    KNOWN_WHALES = {
-        # Justin Sun
-        "0x3ddfa8ec3052539b6c9549f12cea2c295cff5296": {"name": "Justin Sun", "confidence": 0.95},
-        "0x176f3dab24a159341c0509bb36b833e7fdd0a132": {"name": "Justin Sun", "confidence": 0.9},
+    info = KNOWN_WHALES.get(address.lower())
+    if info is None:
+        return []
 
-        # Major entities
-        "0x40ec5b33f54e0e8a33a975908c5ba1c14e5bbbdf": {"name": "Polygon Bridge", "confidence": 0.95},
-        "0x1db92e2eebc8e0c075a02bea49a2935bcd2dfcf4": {"name": "Stargate Finance", "confidence": 0.95},
+    return [{
+        'source': 'Known Whales DB',
+        'label': info['name'],
+        'confidence': info['confidence']
+    }]
 
-        # Trend Research cluster
-        "0x85e67feb76596f08a4dbebfdcbed3d0e9bf60ae9": {"name": "Trend Research", "confidence": 0.85},
-        "0xfaf6f6ffaf0ea8815a8ceeee6399ebe9bfe72a7a": {"name": "Trend Research", "confidence": 0.85},
-
-        # 7 Siblings
-        "0xbcd0f3c2e6e73d6c2e1e8e0c6e52c4f2e2a1d0c9": {"name": "7 Siblings", "confidence": 0.8},
-    }
 
-    results = []
-    addr_lower = address.lower()
+# ============================================================================
+# Full OSINT Aggregation
+# ============================================================================
 
-    if addr_lower in KNOWN_WHALES:
-        info = KNOWN_WHALES[addr_lower]
-        results.append({
-            'source': 'Known Whales DB',
-            'label': info['name'],
-            'confidence': info['confidence']
-        })
+def is_known_whale(address: str) -> bool:
+    """True if the address has a curated KNOWN_WHALES label."""
+    return address.lower() in KNOWN_WHALES
 
-    return results
 
+def _known_whale_result(addr_lower: str, whale_labels: List[dict]) -> dict:
+    """aggregate_osint() result from the whale label alone (no network)."""
+    return {
+        'address': addr_lower,
+        'ens': None,
+        'snapshot': None,
+        'delegations': None,
+        'whale_labels': whale_labels,
+        'identity_signals': [f"Whale Tracker: {label['label']}" for label in whale_labels],
+        'inferred_identity': whale_labels[0]['label'],
+        'confidence': min(max(l['confidence'] for l in whale_labels), 0.95)
+    }
 
-# ============================================================================
-# Full OSINT Aggregation
-# ============================================================================
 
-def aggregate_osint(address: str) -> dict:
+def aggregate_osint(address: str,
+                    ens_prefetch: Optional[Dict[str, Tuple[Optional[str], Dict[str, str]]]] = None,
+                    deep: bool = False,
+                    governance_prefetch: Optional[Dict[str, Tuple[dict, dict]]] = None,
+                    overlap: bool = False) -> dict:
     """
     Aggregate all OSINT sources for an address.
+
+    ens_prefetch and governance_prefetch are optional batch_resolve_ens() /
+    batch_governance_activity() results; addresses found in them skip the
+    per-address ENS or Snapshot query.
+
+    overlap runs the Snapshot query in the background while ENS resolves.
+    It is meant for single-address lookups; batch callers already run
+    addresses concurrently.
+
+    Known whales are already labeled with high confidence, so unless deep
+    is set they return straight from KNOWN_WHALES without ENS or Snapshot
+    lookups (snapshot/delegations are None in that case).
     """
+    addr_lower = address.lower()
+
+    # Whale Tracker Check
+    whale_labels = check_whale_trackers(addr_lower)
+    if whale_labels and not deep:
+        return _known_whale_result(addr_lower, whale_labels)
+
     result = {
-        'address': address.lower(),
+        'address': addr_lower,
         'ens': None,
         'snapshot': None,
         'delegations': None,
@@ -493,11 +1062,23 @@ def aggregate_osint(address: str) -> dict:
         'confidence': 0.0
     }
 
+    ens_cached = ens_prefetch is not None and addr_lower in ens_prefetch
+    governance_cached = governance_prefetch is not None and addr_lower in governance_prefetch
+
+    # ENS and Snapshot are separate hosts with separate rate limits, so when
+    # both need a request, fetch Snapshot in the background meanwhile
+    governance_future = None
+    if overlap and not ens_cached and not governance_cached:
+        governance_future = get_lookup_executor().submit(get_governance_activity, addr_lower)
+
     # ENS Resolution
-    print(f"    Checking ENS for {address[:10]}...")
-    ens_name = resolve_ens_reverse(address)
+    matched_protocol = None
+    if ens_cached:
+        ens_name, text_records = ens_prefetch[addr_lower]
+    else:
+        print(f"    Checking ENS for {address[:10]}...")
+        ens_name, text_records = resolve_ens_with_records(addr_lower)
     if ens_name:
-        text_records = get_ens_text_records(ens_name)
         result['ens'] = {
             'name': ens_name,
             'text_records': text_records
@@ -511,18 +1092,21 @@ def aggregate_osint(address: str) -> dict:
             result['identity_signals'].append(f"Matches Protocol: {matched_protocol}")
 
     # Snapshot Activity
-    print(f"    Checking Snapshot...")
-    snapshot = get_snapshot_activity(address)
+    if governance_cached:
+        snapshot, delegations = governance_prefetch[addr_lower]
+    else:
+        print(f"    Checking Snapshot...")
+        if governance_future is not None:
+            snapshot, delegations = governance_future.result()
+        else:
+            snapshot, delegations = get_governance_activity(addr_lower)
     result['snapshot'] = snapshot
-
-    delegations = get_delegations(address)
     result['delegations'] = delegations
 
     gov_signals = extract_governance_identity_signals(snapshot, delegations)
     result['identity_signals'].extend(gov_signals)
 
-    # Whale Tracker Check
-    whale_labels = check_whale_trackers(address)
+    # Whale Tracker labels
     result['whale_labels'] = whale_labels
 
     if whale_labels:
@@ -553,12 +1137,54 @@ def aggregate_osint(address: str) -> dict:
     # Infer identity
     if whale_labels:
         result['inferred_identity'] = whale_labels[0]['label']
-    elif result['ens'] and match_protocol_pattern(result['ens']['name']):
-        result['inferred_identity'] = f"{match_protocol_pattern(result['ens']['name'])} Related"
+    elif matched_protocol:
+        result['inferred_identity'] = f"{matched_protocol} Related"
 
     return result
 
 
+def iter_osint(addresses: List[str], max_workers: int = DEFAULT_WORKERS,
+               deep: bool = False) -> Iterator[dict]:
+    """
+    Run aggregate_osint over addresses on a thread pool.
+
+    Results are yielded in input order, so callers can write them to the
+    knowledge graph or a CSV from the calling thread. ENS and Snapshot
+    activity are fetched for the whole list up front in batched queries.
+
+    Addresses are submitted in batches that double after a clean batch and
+    halve when an upstream API answered 429/5xx, so bursts back off
+    instead of piling up retries.
+    """
+    lookup = addresses if deep else [a for a in addresses if not is_known_whale(a)]
+    ens_prefetch = batch_resolve_ens(lookup)
+    governance_prefetch = batch_governance_activity(lookup)
+    batch_size = BATCH_SIZE_START
+    start = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while start < len(addresses):
+            batch = addresses[start:start + batch_size]
+            start += len(batch)
+            throttled_before = _throttled_responses
+            batch_start = time.monotonic()
+
+            yield from executor.map(
+                lambda addr: aggregate_osint(addr, ens_prefetch, deep, governance_prefetch),
+                batch
+            )
+
+            elapsed = time.monotonic() - batch_start
+            throttled = _throttled_responses > throttled_before
+            print(f"    Batch of {len(batch)} in {elapsed:.1f}s "
+                  f"({len(batch) / max(elapsed, 1e-6):.1f} addr/s)"
+                  f"{' - throttled, shrinking batch' if throttled else ''}")
+            if throttled:
+                batch_size = max(1, batch_size // 2)
+            else:
+                batch_size = min(BATCH_SIZE_MAX, batch_size * 2)
+
+
 # ============================================================================
 # Knowledge Graph Integration
 # ============================================================================
@@ -568,8 +1194,20 @@ def process_single_address(kg: 'KnowledgeGraph', addr: str):
     Process a single address through the OSINT layer.
     Called by build_knowledge_graph for per-address error handling.
     """
-    osint = aggregate_osint(addr)
+    osint = aggregate_osint(addr, overlap=True)
+    store_osint(kg, addr, osint)
+    return osint
+
+
+def store_osint(kg: 'KnowledgeGraph', addr: str, osint: dict,
+                identities: Optional[Dict[str, str]] = None):
+    """
+    Write one aggregate_osint() result to the knowledge graph.
 
+    identities is an optional {address: identity} map preloaded by the
+    caller (see load_identities); when given it replaces the per-address
+    entity lookup and is kept current with the identities written here.
+    """
     # Store ENS if found
     if osint.get('ens'):
         kg.add_entity(addr, ens_name=osint['ens']['name'])
@@ -582,7 +1220,7 @@ def process_single_address(kg: 'KnowledgeGraph', addr: str):
         )
 
     # Store Snapshot activity
-    if osint.get('snapshot', {}).get('has_votes'):
+    if (osint.get('snapshot') or {}).get('has_votes'):
         snap = osint['snapshot']
         kg.add_evidence(
             addr,
@@ -593,7 +1231,7 @@ def process_single_address(kg: 'KnowledgeGraph', addr: str):
         )
 
         # If significant delegate, mark as known entity
-        if osint.get('delegations', {}).get('is_delegate'):
+        if (osint.get('delegations') or {}).get('is_delegate'):
             kg.add_entity(addr, entity_type='individual')  # Fixed: was 'known_entity'
             kg.add_evidence(
                 addr,
@@ -618,6 +1256,8 @@ def process_single_address(kg: 'KnowledgeGraph', addr: str):
                 identity=label['label'],
                 confidence=label['confidence']
             )
+            if identities is not None:
+                identities[addr.lower()] = label['label']
 
     # Store identity signals
     for signal in osint.get('identity_signals', []):
@@ -630,96 +1270,45 @@ def process_single_address(kg: 'KnowledgeGraph', addr: str):
 
     # If we inferred an identity
     if osint.get('inferred_identity') and osint['confidence'] >= 0.5:
-        current = kg.get_entity(addr)
-        if not current or not current.get('identity'):
+        if identities is not None:
+            current_identity = identities.get(addr.lower())
+        else:
+            current_identity = (kg.get_entity(addr) or {}).get('identity')
+        if not current_identity:
             kg.set_identity(
                 addr,
                 identity=osint['inferred_identity'],
                 confidence=osint['confidence']
             )
+            if identities is not None:
+                identities[addr.lower()] = osint['inferred_identity']
 
-    return osint
+
+def load_identities(kg: 'KnowledgeGraph') -> Dict[str, str]:
+    """All identified entities as {address: identity}, in one query."""
+    conn = kg.connect()
+    return dict(conn.execute(
+        "SELECT address, identity FROM entities WHERE identity IS NOT NULL AND identity != ''"
+    ).fetchall())
 
 
-def process_addresses(kg: 'KnowledgeGraph', addresses: List[str]):
+def process_addresses(kg: 'KnowledgeGraph', addresses: List[str],
+                      max_workers: int = DEFAULT_WORKERS, deep: bool = False):
     """
     Process addresses through the OSINT layer.
+
+    Lookups run concurrently; knowledge graph writes stay on this thread.
     """
     print(f"\n  Processing {len(addresses)} addresses through OSINT layer...")
 
-    for i, addr in enumerate(addresses):
+    # One query up front instead of an entity lookup per inferred identity
+    identities = load_identities(kg)
+
+    for i, (addr, osint) in enumerate(zip(addresses, iter_osint(addresses, max_workers, deep))):
         if (i + 1) % 10 == 0:
             print(f"\n    Progress: {i+1}/{len(addresses)}")
 
-        osint = aggregate_osint(addr)
-
-        # Store ENS if found
-        if osint.get('ens'):
-            kg.add_entity(addr, ens_name=osint['ens']['name'])
-            kg.add_evidence(
-                addr,
-                source='ENS',
-                claim=f"ENS Name: {osint['ens']['name']}",
-                confidence=0.9,
-                raw_data=osint['ens']
-            )
-
-        # Store Snapshot activity
-        if osint.get('snapshot', {}).get('has_votes'):
-            snap = osint['snapshot']
-            kg.add_evidence(
-                addr,
-                source='Snapshot',
-                claim=f"Voted {snap['total_votes']} times in {snap['unique_spaces']} DAOs",
-                confidence=0.7,
-                raw_data=snap
-            )
-
-            # If significant delegate, mark as known entity
-            if osint.get('delegations', {}).get('is_delegate'):
-                kg.add_entity(addr, entity_type='known_entity')
-                kg.add_evidence(
-                    addr,
-                    source='Snapshot',
-                    claim=f"Receives delegations - known governance participant",
-                    confidence=0.8,
-                    raw_data=osint['delegations']
-                )
-
-        # Store whale labels
-        for label in osint.get('whale_labels', []):
-            kg.add_evidence(
-                addr,
-                source=label['source'],
-                claim=f"Identified as: {label['label']}",
-                confidence=label['confidence']
-            )
-
-            if label['confidence'] >= 0.7:
-                kg.set_identity(
-                    addr,
-                    identity=label['label'],
-                    confidence=label['confidence']
-                )
-
-        # Store identity signals
-        for signal in osint.get('identity_signals', []):
-            kg.add_evidence(
-                addr,
-                source='OSINT',
-                claim=signal,
-                confidence=0.5
-            )
-
-        # If we inferred an identity
-        if osint.get('inferred_identity') and osint['confidence'] >= 0.5:
-            current = kg.get_entity(addr)
-            if not current or not current.get('identity'):
-                kg.set_identity(
-                    addr,
-                    identity=osint['inferred_identity'],
-                    confidence=osint['confidence']
-                )
+        store_osint(kg, addr, osint, identities)
 
     print(f"\n  OSINT layer complete. Processed {len(addresses)} addresses")
 
@@ -728,6 +1317,31 @@ def process_addresses(kg: 'KnowledgeGraph', addresses: List[str]):
 # Standalone Mode
 # ============================================================================
 
+OSINT_CSV_HEADER = [
+    "address", "ens_name", "snapshot_votes", "snapshot_spaces",
+    "voting_power", "is_delegate", "whale_labels", "identity_signals",
+    "inferred_identity", "confidence"
+]
+
+
+def osint_csv_row(r: dict) -> list:
+    """Flatten one aggregate_osint() result into an OSINT_CSV_HEADER row."""
+    ens = r.get('ens') or {}
+    snapshot = r.get('snapshot') or {}
+    return [
+        r['address'],
+        ens.get('name', ''),
+        snapshot.get('total_votes', 0),
+        snapshot.get('unique_spaces', 0),
+        snapshot.get('total_voting_power', 0),
+        (r.get('delegations') or {}).get('is_delegate', False),
+        '|'.join(l['label'] for l in r.get('whale_labels', [])),
+        '|'.join(r.get('identity_signals', [])),
+        r.get('inferred_identity', ''),
+        r.get('confidence', 0)
+    ]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="OSINT Aggregator - Layer 3",
@@ -738,15 +1352,25 @@ def main():
     parser.add_argument("-o", "--output", help="Output CSV file")
     parser.add_argument("--address", help="Analyze single address")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent address lookups (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always query the APIs, ignoring cached results")
+    parser.add_argument("--deep", action="store_true",
+                        help="Also run ENS/Snapshot lookups for already-known whales")
 
     args = parser.parse_args()
 
+    if args.no_cache:
+        global CACHE_ENABLED
+        CACHE_ENABLED = False
+
     if not args.input and not args.address:
         parser.error("Input CSV or --address required")
 
     # Single address mode
     if args.address:
-        result = aggregate_osint(args.address)
+        result = aggregate_osint(args.address, deep=args.deep, overlap=True)
         print(json.dumps(result, indent=2, default=str))
         return
 
@@ -758,39 +1382,42 @@ def main():
 
     print(f"Processing {len(addresses)} addresses...")
 
-    results = []
-    for addr in addresses:
-        result = aggregate_osint(addr)
-        results.append(result)
+    # Stream each result to the CSV as it arrives, counting the summary on
+    # the way through; only --json needs the full list kept in memory
+    results = [] if args.json else None
+    counts = dict.fromkeys(('total', 'ens', 'snapshot', 'labels', 'identity'), 0)
+
+    def tally(stream):
+        for r in stream:
+            counts['total'] += 1
+            counts['ens'] += bool(r.get('ens'))
+            counts['snapshot'] += bool((r.get('snapshot') or {}).get('has_votes'))
+            counts['labels'] += bool(r.get('whale_labels'))
+            counts['identity'] += bool(r.get('inferred_identity'))
+            if results is not None:
+                results.append(r)
+            yield r
+
+    stream = tally(iter_osint(addresses, args.workers, args.deep))
+    if args.output:
+        # Large buffer batches write syscalls on big runs
+        with open(args.output, "w", newline="", buffering=1 << 20) as out:
+            writer = csv.writer(out)
+            writer.writerow(OSINT_CSV_HEADER)
+            writer.writerows(osint_csv_row(r) for r in stream)
+    else:
+        for _ in stream:
+            pass
 
     # Output
     if args.json:
-        print(json.dumps(results, indent=2, default=str))
+        # orjson would print NaN/Infinity as null; keep the stdlib's output then
+        if HAS_ORJSON and not _has_non_finite(results):
+            print(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(json.dumps(results, indent=2, default=str))
 
-    # Save to CSV
     if args.output:
-        with open(args.output, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "address", "ens_name", "snapshot_votes", "snapshot_spaces",
-                "voting_power", "is_delegate", "whale_labels", "identity_signals",
-                "inferred_identity", "confidence"
-            ])
-
-            for r in results:
-                writer.writerow([
-                    r['address'],
-                    r.get('ens', {}).get('name', ''),
-                    r.get('snapshot', {}).get('total_votes', 0),
-                    r.get('snapshot', {}).get('unique_spaces', 0),
-                    r.get('snapshot', {}).get('total_voting_power', 0),
-                    r.get('delegations', {}).get('is_delegate', False),
-                    '|'.join(l['label'] for l in r.get('whale_labels', [])),
-                    '|'.join(r.get('identity_signals', [])),
-                    r.get('inferred_identity', ''),
-                    r.get('confidence', 0)
-                ])
-
         print(f"Saved to {args.output}")
 
     # Summary
@@ -798,16 +1425,11 @@ def main():
     print("SUMMARY")
     print(f"{'='*60}")
 
-    with_ens = sum(1 for r in results if r.get('ens'))
-    with_snapshot = sum(1 for r in results if r.get('snapshot', {}).get('has_votes'))
-    with_labels = sum(1 for r in results if r.get('whale_labels'))
-    with_identity = sum(1 for r in results if r.get('inferred_identity'))
-
-    print(f"Total: {len(results)}")
-    print(f"With ENS: {with_ens}")
-    print(f"With Snapshot votes: {with_snapshot}")
-    print(f"With whale labels: {with_labels}")
-    print(f"With inferred identity: {with_identity}")
+    print(f"Total: {counts['total']}")
+    print(f"With ENS: {counts['ens']}")
+    print(f"With Snapshot votes: {counts['snapshot']}")
+    print(f"With whale labels: {counts['labels']}")
+    print(f"With inferred identity: {counts['identity']}")
 
 
 if __name__ == "__main__":
@@ -30,7 +30,7 @@ import sys
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 
 # ============================================================================
 # Entity Templates
@@ -137,111 +137,154 @@ ENTITY_TEMPLATES = {
 # Pattern Matching Functions
 # ============================================================================
 
+# Criteria in evaluation order with their weights. Pattern keys not listed
+# here (e.g. funding_pattern, cross_chain) are informational only.
+TEMPLATE_CRITERIA = (
+    ("contract_type", 1),
+    ("entity_type", 1),
+    ("cluster_size", 1),
+    ("has_ens", 0.5),
+    ("snapshot_activity", 0.5),
+    ("trading_style", 1),
+    ("risk_profile", 0.5),
+    ("activity_pattern", 0.5),
+    ("gas_strategy", 0.5),
+)
+
+# Generated source per criterion: (load `v`, match condition, label).
+# {x} names the template's expected value in the generated function's
+# globals; keys not listed use _EQUALS_SOURCE.
+_CRITERION_SOURCE = {
+    "contract_type": ('v = e.get("contract_type")', 'v and {x} in v', '{x}_label'),
+    "entity_type": ('v = e.get("entity_type")', 'v == {x}', '{x}_label'),
+    "cluster_size": ('v = e.get("cluster_size", 0)', '{x}_min <= v <= {x}_max', 'f"cluster_size={{v}}"'),
+    "has_ens": ('v = bool(e.get("ens_name"))', 'v == {x}', 'f"has_ens={{v}}"'),
+    "snapshot_activity": ('v = e.get("snapshot_votes", 0) > 0', 'v == {x}', 'f"snapshot_activity={{v}}"'),
+    "activity_pattern": ('v = e.get("activity_pattern")', 'v and {x} in v', 'f"activity_pattern={{v}}"'),
+}
+_EQUALS_SOURCE = ('v = e.get("{key}")', 'v == {x}', 'f"{key}={{v}}"')
+
+
+def compile_template(template: dict) -> Callable[[dict], Tuple[bool, float, List[str]]]:
+    """
+    Generate a matcher function specialized to one template.
+
+    The function contains only the checks the template uses, with its
+    expected values and total weight baked in, so matching an entity is a
+    straight run of comparisons. Returns f(entity_data) ->
+    (matches, score, matched_criteria), as match_template does.
+    """
+    patterns = template.get("patterns", {})
+    namespace = {}
+    lines = ["def match(e):", "    w = 0", "    m = []"]
+    total_weight = 0
+
+    for i, (key, weight) in enumerate(TEMPLATE_CRITERIA):
+        if key not in patterns:
+            continue
+        expected = patterns[key]
+        x = f"_p{i}"
+        total_weight += weight
+
+        load, condition, label = _CRITERION_SOURCE.get(key, _EQUALS_SOURCE)
+        if key == "cluster_size":
+            namespace[x + "_min"] = expected.get("min", 0)
+            namespace[x + "_max"] = expected.get("max", float('inf'))
+        elif isinstance(expected, list):
+            expected = frozenset(expected)
+            condition = 'v in {x}'
+        namespace[x] = expected
+        namespace[x + "_label"] = f"{key}={patterns[key]}"
+
+        lines += [
+            "    " + load.format(key=key),
+            "    if " + condition.format(x=x) + ":",
+            "        m.append(" + label.format(x=x, key=key) + ")",
+            f"        w += {weight}",
+        ]
+
+    # Determine if it's a match (>50% of criteria matched)
+    lines.append(f"    score = w / {total_weight}" if total_weight > 0 else "    score = 0")
+    lines.append("    return score >= 0.5, score, m")
+
+    exec("\n".join(lines), namespace)
+    return namespace["match"]
+
+
+def match_compiled_template(entity_data: dict, compiled: Callable) -> Tuple[bool, float, List[str]]:
+    """
+    Check if an entity matches a template compiled by compile_template.
+
+    Returns:
+        (matches, score, matched_criteria)
+    """
+    return compiled(entity_data)
+
+
+def _match_criterion(key: str, expected, entity_data: dict) -> Optional[str]:
+    """Label for one template criterion the entity meets, else None (see _CRITERION_SOURCE)."""
+    if key == "cluster_size":
+        v = entity_data.get("cluster_size", 0)
+        if expected.get("min", 0) <= v <= expected.get("max", float('inf')):
+            return f"cluster_size={v}"
+        return None
+
+    if key == "has_ens":
+        v = bool(entity_data.get("ens_name"))
+    elif key == "snapshot_activity":
+        v = entity_data.get("snapshot_votes", 0) > 0
+    else:
+        v = entity_data.get(key)
+
+    if isinstance(expected, list):
+        matched = v in expected
+    elif key in ("contract_type", "activity_pattern"):
+        matched = v and expected in v
+    else:
+        matched = v == expected
+    if not matched:
+        return None
+
+    if key in ("contract_type", "entity_type"):
+        return f"{key}={expected}"
+    return f"{key}={v}"
+
+
 def match_template(entity_data: dict, template: dict) -> Tuple[bool, float, List[str]]:
     """
     Check if an entity matches a template.
 
+    Interprets the template directly, which is cheaper than generating a
+    matcher for a one-off template; repeated matching against the same
+    template should use compile_template.
+
     Returns:
         (matches, score, matched_criteria)
     """
     patterns = template.get("patterns", {})
     matched = []
-    total_weight = 0
     matched_weight = 0
+    total_weight = 0
 
-    # Contract type check
-    if "contract_type" in patterns:
-        total_weight += 1
-        if entity_data.get("contract_type") and patterns["contract_type"] in entity_data["contract_type"]:
-            matched.append(f"contract_type={patterns['contract_type']}")
-            matched_weight += 1
-
-    # Entity type check
-    if "entity_type" in patterns:
-        total_weight += 1
-        if entity_data.get("entity_type") == patterns["entity_type"]:
-            matched.append(f"entity_type={patterns['entity_type']}")
-            matched_weight += 1
-
-    # Cluster size check
-    if "cluster_size" in patterns:
-        total_weight += 1
-        cluster_size = entity_data.get("cluster_size", 0)
-        size_range = patterns["cluster_size"]
-        if size_range.get("min", 0) <= cluster_size <= size_range.get("max", float('inf')):
-            matched.append(f"cluster_size={cluster_size}")
-            matched_weight += 1
-
-    # ENS check
-    if "has_ens" in patterns:
-        total_weight += 0.5
-        has_ens = bool(entity_data.get("ens_name"))
-        if has_ens == patterns["has_ens"]:
-            matched.append(f"has_ens={has_ens}")
-            matched_weight += 0.5
-
-    # Snapshot activity check
-    if "snapshot_activity" in patterns:
-        total_weight += 0.5
-        has_votes = entity_data.get("snapshot_votes", 0) > 0
-        if has_votes == patterns["snapshot_activity"]:
-            matched.append(f"snapshot_activity={has_votes}")
-            matched_weight += 0.5
-
-    # Trading style check
-    if "trading_style" in patterns:
-        total_weight += 1
-        style = entity_data.get("trading_style")
-        expected = patterns["trading_style"]
-        if isinstance(expected, list):
-            if style in expected:
-                matched.append(f"trading_style={style}")
-                matched_weight += 1
-        elif style == expected:
-            matched.append(f"trading_style={style}")
-            matched_weight += 1
-
-    # Risk profile check
-    if "risk_profile" in patterns:
-        total_weight += 0.5
-        profile = entity_data.get("risk_profile")
-        expected = patterns["risk_profile"]
-        if isinstance(expected, list):
-            if profile in expected:
-                matched.append(f"risk_profile={profile}")
-                matched_weight += 0.5
-        elif profile == expected:
-            matched.append(f"risk_profile={profile}")
-            matched_weight += 0.5
-
-    # Activity pattern check
-    if "activity_pattern" in patterns:
-        total_weight += 0.5
-        pattern = entity_data.get("activity_pattern")
-        if pattern and patterns["activity_pattern"] in pattern:
-            matched.append(f"activity_pattern={pattern}")
-            matched_weight += 0.5
-
-    # Gas strategy check
-    if "gas_strategy" in patterns:
-        total_weight += 0.5
-        gas = entity_data.get("gas_strategy")
-        expected = patterns["gas_strategy"]
-        if isinstance(expected, list):
-            if gas in expected:
-                matched.append(f"gas_strategy={gas}")
-                matched_weight += 0.5
-        elif gas == expected:
-            matched.append(f"gas_strategy={gas}")
-            matched_weight += 0.5
-
-    # Calculate score
-    score = matched_weight / total_weight if total_weight > 0 else 0
+    for key, weight in TEMPLATE_CRITERIA:
+        if key not in patterns:
+            continue
+        total_weight += weight
+        label = _match_criterion(key, patterns[key], entity_data)
+        if label is not None:
+            matched.append(label)
+            matched_weight += weight
 
     # Determine if it's a match (>50% of criteria matched)
-    matches = score >= 0.5
+    score = matched_weight / total_weight if total_weight > 0 else 0
+    return score >= 0.5, score, matched
 
-    return matches, score, matched
+
+# Built-in templates compiled once at import
+COMPILED_TEMPLATES = {
+    template_id: compile_template(template)
+    for template_id, template in ENTITY_TEMPLATES.items()
+}
 
 
 def find_cluster_pattern_matches(kg: 'KnowledgeGraph') -> List[dict]:
@@ -252,45 +295,41 @@ def find_cluster_pattern_matches(kg: 'KnowledgeGraph') -> List[dict]:
 
     # Get all clusters
     conn = kg.connect()
-    clusters = conn.execute("SELECT * FROM clusters").fetchall()
+    clusters = [dict(c) for c in conn.execute("SELECT * FROM clusters").fetchall()]
+
+    # Member identities for every cluster in one pass, instead of one
+    # query per cluster (twice over)
+    member_identities = defaultdict(list)
+    for cluster_id, identity in conn.execute(
+        "SELECT cluster_id, identity FROM entities WHERE cluster_id IS NOT NULL"
+    ):
+        member_identities[cluster_id].append(identity)
 
     # Get identified clusters as templates
     identified_clusters = []
     for cluster in clusters:
-        cluster = dict(cluster)
-        members = conn.execute(
-            "SELECT * FROM entities WHERE cluster_id = ?", (cluster['id'],)
-        ).fetchall()
+        identities = member_identities.get(cluster['id'], [])
 
         # Check if any member is identified
-        identified_member = None
-        for m in members:
-            m = dict(m)
-            if m.get('identity'):
-                identified_member = m
-                break
-
-        if identified_member:
+        identity = next((i for i in identities if i), None)
+
+        if identity:
             identified_clusters.append({
                 'cluster': cluster,
-                'identity': identified_member['identity'],
-                'size': len(members),
+                'identity': identity,
+                'size': len(identities),
                 'methods': json.loads(cluster.get('detection_methods', '[]'))
             })
 
     # Compare unidentified clusters to identified ones
     for cluster in clusters:
-        cluster = dict(cluster)
-        members = conn.execute(
-            "SELECT * FROM entities WHERE cluster_id = ?", (cluster['id'],)
-        ).fetchall()
+        identities = member_identities.get(cluster['id'], [])
 
         # Skip if already identified
-        has_identified = any(dict(m).get('identity') for m in members)
-        if has_identified:
+        if any(identities):
             continue
 
-        cluster_size = len(members)
+        cluster_size = len(identities)
         cluster_methods = json.loads(cluster.get('detection_methods', '[]'))
 
         # Compare to identified clusters
@@ -319,39 +358,36 @@ def find_cluster_pattern_matches(kg: 'KnowledgeGraph') -> List[dict]:
     return results
 
 
-def aggregate_evidence_score(kg: 'KnowledgeGraph', address: str) -> Tuple[float, List[str]]:
-    """
-    Aggregate all evidence for an address to compute final confidence.
-    """
-    evidence = kg.get_evidence(address)
+# Weight by source
+EVIDENCE_SOURCE_WEIGHTS = {
+    'CIO': 0.9,
+    'CrossChain': 0.8,
+    'Behavioral': 0.6,
+    'ENS': 0.9,
+    'Snapshot': 0.7,
+    'OSINT': 0.5,
+    'Known Whales DB': 0.95,
+    'Pattern Match': 0.7,
+}
 
-    if not evidence:
-        return 0.0, []
 
-    # Weight by source
-    source_weights = {
-        'CIO': 0.9,
-        'CrossChain': 0.8,
-        'Behavioral': 0.6,
-        'ENS': 0.9,
-        'Snapshot': 0.7,
-        'OSINT': 0.5,
-        'Known Whales DB': 0.95,
-        'Pattern Match': 0.7,
-    }
+def evidence_score(evidence: List[dict]) -> float:
+    """
+    Final confidence for a list of evidence rows.
 
-    # Use MAX confidence per source to prevent low-confidence items from diluting
-    # high-confidence evidence (e.g., 50 behavioral signals shouldn't drown out 1 CIO)
+    Uses MAX confidence per source to prevent low-confidence items from
+    diluting high-confidence evidence (e.g., 50 behavioral signals shouldn't
+    drown out 1 CIO), then a source-weighted average of those maxima.
+    """
     source_max_conf = {}  # source -> max confidence seen
-    claims = []
 
     for ev in evidence:
         source = ev.get('source', 'Unknown')
         conf = ev.get('confidence', 0.5)
-        claims.append(f"[{source}] {ev.get('claim', '')[:50]}...")
 
         # Keep only the highest confidence per source
-        if source not in source_max_conf or conf > source_max_conf[source]:
+        prior = source_max_conf.get(source)
+        if prior is None or conf > prior:
             source_max_conf[source] = conf
 
     # Calculate weighted average using max confidence per source
@@ -359,13 +395,34 @@ def aggregate_evidence_score(kg: 'KnowledgeGraph', address: str) -> Tuple[float,
     weighted_confidence = 0
 
     for source, conf in source_max_conf.items():
-        weight = source_weights.get(source, 0.5)
+        weight = EVIDENCE_SOURCE_WEIGHTS.get(source, 0.5)
         total_weight += weight
         weighted_confidence += conf * weight
 
-    final_confidence = weighted_confidence / total_weight if total_weight > 0 else 0
+    return weighted_confidence / total_weight if total_weight > 0 else 0
+
+
+def format_evidence_claims(evidence: List[dict]) -> List[str]:
+    """Short "[source] claim..." lines for display."""
+    return [
+        f"[{ev.get('source', 'Unknown')}] {ev.get('claim', '')[:50]}..."
+        for ev in evidence
+    ]
 
-    return final_confidence, claims
+
+def aggregate_evidence_score(kg: 'KnowledgeGraph', address: str) -> Tuple[float, List[str]]:
+    """
+    Aggregate all evidence for an address to compute final confidence.
+
+    Callers that only need the score should use evidence_score() and skip
+    formatting the claims.
+    """
+    evidence = kg.get_evidence(address)
+
+    if not evidence:
+        return 0.0, []
+
+    return evidence_score(evidence), format_evidence_claims(evidence)
 
 
 # ============================================================================
@@ -379,6 +436,7 @@ def match_patterns(kg: 'KnowledgeGraph'):
     print("\n  Running pattern matching...")
 
     conn = kg.connect()
+    now = datetime.now(timezone.utc).isoformat()
 
     # Get unidentified entities
     unidentified = conn.execute(
@@ -391,35 +449,33 @@ def match_patterns(kg: 'KnowledgeGraph'):
 
     print(f"    Found {len(unidentified)} unidentified entities")
 
+    # Cluster sizes and Snapshot voters in bulk rather than per entity
+    cluster_sizes = dict(conn.execute(
+        "SELECT cluster_id, COUNT(*) FROM entities WHERE cluster_id IS NOT NULL GROUP BY cluster_id"
+    ).fetchall())
+    snapshot_addrs = {row[0] for row in conn.execute(
+        "SELECT DISTINCT entity_address FROM evidence WHERE source = 'Snapshot'"
+    )}
+
     matched_count = 0
+    # Writes are buffered and flushed in one transaction per phase
+    evidence_buffer = []
+    entity_type_buffer = []
 
     for row in unidentified:
         entity = dict(row)
         address = entity['address']
 
-        # Get cluster info
         cluster_id = entity.get('cluster_id')
-        if cluster_id:
-            cluster = conn.execute(
-                "SELECT COUNT(*) as size FROM entities WHERE cluster_id = ?", (cluster_id,)
-            ).fetchone()
-            entity['cluster_size'] = cluster[0] if cluster else 0
-        else:
-            entity['cluster_size'] = 0
-
-        # Get snapshot info
-        snapshot_evidence = conn.execute(
-            "SELECT * FROM evidence WHERE entity_address = ? AND source = 'Snapshot'",
-            (address,)
-        ).fetchone()
-        entity['snapshot_votes'] = 1 if snapshot_evidence else 0
+        entity['cluster_size'] = cluster_sizes.get(cluster_id, 0) if cluster_id else 0
+        entity['snapshot_votes'] = 1 if address in snapshot_addrs else 0
 
         # Match against templates
         best_match = None
         best_score = 0
 
         for template_id, template in ENTITY_TEMPLATES.items():
-            matches, score, criteria = match_template(entity, template)
+            matches, score, criteria = match_compiled_template(entity, COMPILED_TEMPLATES[template_id])
 
             if matches and score > best_score:
                 best_match = {
@@ -433,22 +489,31 @@ def match_patterns(kg: 'KnowledgeGraph'):
 
         if best_match and best_match['confidence'] >= 0.5:
             # Record the match
-            kg.add_evidence(
+            evidence_buffer.append((
                 address,
-                source='Pattern Match',
-                claim=f"Matches {best_match['template_name']} pattern ({best_match['score']:.0%})",
-                confidence=best_match['confidence'],
-                raw_data=best_match
-            )
+                'Pattern Match',
+                f"Matches {best_match['template_name']} pattern ({best_match['score']:.0%})",
+                best_match['confidence'],
+                None,
+                best_match,
+            ))
 
             # Update entity type if not set
             if not entity.get('entity_type') or entity['entity_type'] == 'unknown':
                 entity_type = ENTITY_TEMPLATES[best_match['template_id']].get('patterns', {}).get('entity_type')
                 if entity_type:
-                    kg.add_entity(address, entity_type=entity_type)
+                    entity_type_buffer.append((entity_type, now, address))
 
             matched_count += 1
 
+    # Evidence and type updates commit together, or roll back together
+    with conn:
+        kg.add_evidence_bulk(evidence_buffer, commit=False)
+        conn.executemany(
+            "UPDATE entities SET entity_type = ?, last_updated = ? WHERE address = ?",
+            entity_type_buffer
+        )
+
     print(f"    Matched {matched_count} entities to templates")
 
     # Find cluster pattern matches
@@ -457,6 +522,7 @@ def match_patterns(kg: 'KnowledgeGraph'):
 
     if cluster_matches:
         print(f"    Found {len(cluster_matches)} potential cluster matches")
+        evidence_buffer = []
         for match in cluster_matches:
             # Get cluster members
             members = conn.execute(
@@ -465,46 +531,44 @@ def match_patterns(kg: 'KnowledgeGraph'):
             ).fetchall()
 
             for m in members:
-                kg.add_evidence(
+                evidence_buffer.append((
                     m[0],
-                    source='Pattern Match',
-                    claim=f"Cluster similar to {match['matched_to']}",
-                    confidence=match['similarity'] * 0.7,
-                    raw_data=match
-                )
+                    'Pattern Match',
+                    f"Cluster similar to {match['matched_to']}",
+                    match['similarity'] * 0.7,
+                    None,
+                    match,
+                ))
+        kg.add_evidence_bulk(evidence_buffer)
 
     # Final confidence aggregation
     print("\n    Aggregating evidence for final scores...")
-    all_entities = conn.execute("SELECT address FROM entities").fetchall()
+    all_entities = conn.execute("SELECT address, identity, cluster_id FROM entities").fetchall()
+
+    # First identified member of each cluster, replacing a per-entity lookup
+    cluster_identity = {}
+    for _, identity, cluster_id in all_entities:
+        if cluster_id and identity:
+            cluster_identity.setdefault(cluster_id, identity)
 
     identified_count = 0
     high_conf_count = 0
+    confidence_buffer = []
 
-    for row in all_entities:
-        address = row[0]
-        final_confidence, claims = aggregate_evidence_score(kg, address)
+    for address, identity, cluster_id in all_entities:
+        final_confidence = evidence_score(kg.get_evidence(address))
 
         if final_confidence > 0:
-            # Update entity confidence
-            kg.add_entity(address, confidence=final_confidence)
-
             if final_confidence >= 0.7:
                 high_conf_count += 1
 
             # Check if we can infer identity from cluster
-            entity = kg.get_entity(address)
-            if not entity.get('identity') and entity.get('cluster_id'):
+            if not identity and cluster_id:
                 # Check if any cluster member is identified
-                cluster_identity = conn.execute(
-                    """SELECT identity FROM entities
-                       WHERE cluster_id = ? AND identity IS NOT NULL AND identity != ''
-                       LIMIT 1""",
-                    (entity['cluster_id'],)
-                ).fetchone()
-
-                if cluster_identity:
+                base_identity = cluster_identity.get(cluster_id)
+
+                if base_identity:
                     # Avoid duplicating "(cluster member)" suffix
-                    base_identity = cluster_identity[0]
                     if base_identity.endswith(" (cluster member)"):
                         new_identity = base_identity
                     else:
@@ -515,6 +579,16 @@ def match_patterns(kg: 'KnowledgeGraph'):
                         confidence=final_confidence * 0.9
                     )
                     identified_count += 1
+                    continue  # set_identity already wrote the scaled confidence
+
+            # Update entity confidence
+            confidence_buffer.append((final_confidence, now, address))
+
+    conn.executemany(
+        "UPDATE entities SET confidence = ?, last_updated = ? WHERE address = ?",
+        confidence_buffer
+    )
+    conn.commit()
 
     print(f"\n  Pattern matching complete:")
     print(f"    Template matches: {matched_count}")
@@ -682,7 +756,7 @@ def main():
         print("="*60)
 
         for template_id, template in ENTITY_TEMPLATES.items():
-            matches, score, criteria = match_template(entity_data, template)
+            matches, score, criteria = match_compiled_template(entity_data, COMPILED_TEMPLATES[template_id])
             if matches:
                 print(f"\n{template['name']} ({template_id})")
                 print(f"  Score: {score:.0%}")
@@ -696,7 +770,7 @@ def main():
             for ev in evidence:
                 print(f"  [{ev['source']}] {ev['claim']} ({ev['confidence']:.0%})")
 
-        final_conf, _ = aggregate_evidence_score(kg, args.address)
+        final_conf = evidence_score(evidence)
         print(f"\nFinal confidence: {final_conf:.0%}")
         return
 
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for multichain_balance.py Multicall3 encoding.
+
+Run: python3 -m pytest scripts/tests/test_multichain_balance.py -v
+"""
+
+import csv
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from multichain_balance import (
+    AGGREGATE3_SELECTOR,
+    BALANCE_OF_SELECTOR,
+    decode_aggregate3,
+    encode_aggregate3,
+    process_csv,
+)
+
+USDC = '0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48'
+HOLDER = '0x' + 'ab' * 20
+
+
+def _words(hex_data):
+    return [hex_data[i:i + 64] for i in range(0, len(hex_data), 64)]
+
+
+def _word(value):
+    return f"{value:064x}"
+
+
+class TestAggregate3:
+    """aggregate3 calldata and return data follow the Solidity ABI layout."""
+
+    def test_encode_single_balance_of(self):
+        calldata = BALANCE_OF_SELECTOR + HOLDER[2:].rjust(64, '0')
+        encoded = encode_aggregate3([(USDC, calldata)])
+
+        assert encoded.startswith(AGGREGATE3_SELECTOR)
+        words = _words(encoded[len(AGGREGATE3_SELECTOR):])
+        assert [int(w, 16) for w in words[:3]] == [0x20, 1, 0x20]
+        assert words[3] == USDC[2:].rjust(64, '0')
+        assert [int(w, 16) for w in words[4:7]] == [1, 0x60, 36]
+        # 36 bytes of calldata are right-padded to two words
+        assert ''.join(words[7:]) == calldata[2:].ljust(128, '0')
+
+    def test_decode_mixed_results(self):
+        # (true, uint256 5), (false, ""), (true, 0x010203)
+        result = (
+            _word(0x20) + _word(3)
+            + _word(0x60) + _word(0xe0) + _word(0x140)
+            + _word(1) + _word(0x40) + _word(32) + _word(5)
+            + _word(0) + _word(0x40) + _word(0)
+            + _word(1) + _word(0x40) + _word(3) + '010203'.ljust(64, '0')
+        )
+        assert decode_aggregate3('0x' + result) == ['0x' + _word(5), None, '0x010203']
+
+    def test_decode_truncated_raises(self):
+        with pytest.raises(ValueError):
+            decode_aggregate3('0x' + _word(0x20) + _word(2))
+
+
+class _FakeChecker:
+    """Stands in for MultichainBalanceChecker: a balance on ethereum only, no network."""
+
+    chains = ['ethereum', 'arbitrum']
+
+    def __init__(self):
+        self.queried = []
+
+    def iter_check(self, addresses):
+        for address in addresses:
+            self.queried.append(address)
+            yield {
+                'address': address,
+                'chains': {'ethereum': {'native_balance': 1.5}},
+                'active_chains': ['ethereum'],
+            }
+
+
+class TestProcessCsv:
+    """process_csv streams rows in order and queries each address once."""
+
+    def _write(self, path, rows):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerows(rows)
+
+    def _read(self, path):
+        with open(path, newline='') as f:
+            return list(csv.DictReader(f))
+
+    def test_dedupes_and_adds_columns(self, tmp_path):
+        src = tmp_path / 'in.csv'
+        self._write(src, [['address', 'note'], [HOLDER, 'a'], ['', 'b'], ['0x' + 'AB' * 20, 'c']])
+        checker = _FakeChecker()
+
+        process_csv(str(src), str(tmp_path / 'out.csv'), checker)
+
+        assert checker.queried == [HOLDER]
+        rows = self._read(tmp_path / 'out.csv')
+        assert [r['note'] for r in rows] == ['a', 'b', 'c']
+        assert [(r['ethereum_balance'], r['arbitrum_balance'], r['chain_count']) for r in rows] == [
+            ('1.5000', '', '1'), ('', '', '0'), ('1.5000', '', '1'),
+        ]
+
+    def test_output_may_overwrite_input(self, tmp_path):
+        src = tmp_path / 'addrs.txt'
+        self._write(src, [['address'], [HOLDER]])
+
+        process_csv(str(src), str(src), _FakeChecker())
+
+        rows = self._read(src)
+        assert [(r['address'], r['active_chains']) for r in rows] == [(HOLDER, 'ethereum')]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['addrs.txt']
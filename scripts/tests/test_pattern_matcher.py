@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for pattern_matcher.py template and cluster matching.
+
+Run: python3 -m pytest scripts/tests/test_pattern_matcher.py -v
+"""
+
+import tempfile
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from build_knowledge_graph import KnowledgeGraph
+from pattern_matcher import (
+    COMPILED_TEMPLATES,
+    ENTITY_TEMPLATES,
+    find_cluster_pattern_matches,
+    match_patterns,
+    match_compiled_template,
+    match_template,
+)
+
+
+def _addresses(start, count):
+    return [f"0x{i:040x}" for i in range(start, start + count)]
+
+
+@pytest.fixture
+def kg():
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+        db_path = Path(f.name)
+
+    kg = KnowledgeGraph(db_path)
+    kg.initialize()
+    yield kg
+
+    kg.close()
+    db_path.unlink()
+
+
+class TestTemplates:
+    """Compiled templates score entities like the template definitions."""
+
+    def test_vc_fund_match(self):
+        entity = {
+            'entity_type': 'fund',
+            'cluster_size': 12,
+            'trading_style': 'spot',
+            'risk_profile': 'aggressive',
+            'ens_name': None,
+            'snapshot_votes': 0,
+        }
+        matches, score, criteria = match_compiled_template(entity, COMPILED_TEMPLATES['vc_fund'])
+
+        assert matches
+        # 4 of 4.5 weighted criteria: risk_profile (0.5) misses
+        assert score == pytest.approx(4 / 4.5)
+        assert criteria == [
+            'entity_type=fund', 'cluster_size=12', 'has_ens=False',
+            'snapshot_activity=False', 'trading_style=spot',
+        ]
+
+    def test_substring_criteria(self):
+        entity = {'contract_type': 'GnosisSafe', 'activity_pattern': 'always_on_weekdays'}
+        _, _, treasury = match_template(entity, ENTITY_TEMPLATES['protocol_treasury'])
+        _, _, exchange = match_template(entity, ENTITY_TEMPLATES['exchange_hot_wallet'])
+
+        assert 'contract_type=Safe' in treasury
+        assert 'activity_pattern=always_on_weekdays' in exchange
+
+    def test_adhoc_template(self):
+        template = {'patterns': {'gas_strategy': ['high', 'very_high']}}
+        assert match_template({'gas_strategy': 'high'}, template) == (True, 1.0, ['gas_strategy=high'])
+        assert match_template({}, {'patterns': {}}) == (False, 0, [])
+
+
+class TestClusterPatterns:
+    """find_cluster_pattern_matches against a real (temporary) knowledge graph."""
+
+    def test_similar_unidentified_cluster(self, kg):
+        known = _addresses(1, 6)
+        kg.create_cluster(known, methods=['cio', 'temporal'])
+        kg.set_identity(known[2], 'Trend Research', 0.9)
+
+        similar = kg.create_cluster(_addresses(10, 5), methods=['cio'])
+        kg.create_cluster(_addresses(20, 2), methods=['cio'])  # too small
+        kg.create_cluster(_addresses(30, 5), methods=['funding'])  # no method overlap
+
+        matches = find_cluster_pattern_matches(kg)
+
+        assert [(m['cluster_id'], m['matched_to']) for m in matches] == [(similar, 'Trend Research')]
+        assert matches[0]['similarity'] == pytest.approx(5 / 6 * 0.4 + 0.6)
+
+
+class TestMatchPatterns:
+    """match_patterns end to end on a small knowledge graph."""
+
+    def test_cluster_member_inherits_identity(self, kg):
+        members = _addresses(1, 3)
+        kg.create_cluster(members, methods=['cio'])
+        kg.set_identity(members[0], 'Trend Research', 0.9)
+        kg.add_evidence(members[1], source='Snapshot', claim='Voted', confidence=0.6)
+
+        match_patterns(kg)
+
+        assert kg.get_entity(members[1])['identity'] == 'Trend Research (cluster member)'
+        # No evidence, so no confidence to propagate
+        assert not kg.get_entity(members[2])['identity']